@@ -1,24 +1,43 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from datetime import timedelta, date
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, delete, func, and_, or_
+from datetime import datetime, timedelta, date
 from typing import List, Optional
+import asyncio
 
-from app.db import get_db, init_db
-from app.models import User, Class, Student, Attendance, Notification
+from app.db import get_db, dialect_insert
+from app.models import User, Class, Student, Attendance, Notification, AttendanceDailyRollup, AttendanceReminder
 from app.schemas import (
     UserCreate, UserResponse, UserUpdate, UserLogin, Token, PasswordChange,
     ClassCreate, ClassResponse, ClassUpdate, ClassWithStudentCount,
-    StudentCreate, StudentResponse, StudentUpdate, StudentWithClass,
-    AttendanceCreate, AttendanceResponse, AttendanceBulkCreate, AttendanceWithStudent,
-    NotificationResponse, DashboardStats
+    StudentCreate, StudentResponse, StudentUpdate, StudentWithClass, StudentImportResult,
+    AttendanceCreate, AttendanceResponse, AttendanceBulkCreate, AttendanceBulkResult, AttendanceWithStudent,
+    AttendanceReport, AttendanceDailySummary, NotificationCreate, NotificationResponse, UnreadCount,
+    NotificationMarkRead, NotificationMarkReadResult,
+    DashboardStats, PaginatedResponse,
+    CLASS_LIST_ADAPTER, STUDENT_PAGE_ADAPTER, ATTENDANCE_LIST_ADAPTER, ATTENDANCE_PAGE_ADAPTER
 )
 from app.auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_user, get_current_active_user, get_admin_user,
+    get_password_hash_async, verify_password_async, password_needs_rehash, create_access_token,
+    get_current_user, get_current_active_user, get_admin_user, invalidate_user,
+    get_bearer_token, revoke_token, still_authorized,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app import (
+    counters, etags, migrations, notifications, reminders, retention, rollups, search as student_search,
+    student_import
+)
+from app.streaming import stream_json_array, stream_ndjson, stream_csv
+from app.serialization import adapter_response
+from app.compression import CompressionMiddleware
+from app.config import settings
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, split_page
+)
 
 app = FastAPI(
     title="School Management System API",
@@ -35,10 +54,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (brotli when installed, else gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
 
 @app.on_event("startup")
 async def startup():
-    await init_db()
+    await migrations.prepare_database()
+    if settings.attendance_reminders:
+        app.state.reminder_task = asyncio.create_task(reminders.run_daily())
+    if settings.notification_retention_days > 0:
+        app.state.retention_task = asyncio.create_task(retention.run_daily())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    for name in ("reminder_task", "retention_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
 
 
 # ==================== AUTH ROUTES ====================
@@ -53,13 +87,15 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     
     db_user = User(
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=await get_password_hash_async(user.password),
         full_name=user.full_name,
         role=user.role.value
     )
     db.add(db_user)
     await db.flush()
     await db.refresh(db_user)
+    if db_user.role == "teacher" and db_user.is_active:
+        await counters.increment(db, {counters.TEACHERS: 1})
     return db_user
 
 
@@ -72,12 +108,18 @@ async def login(
     result = await db.execute(select(User).where(User.email == login_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
     
+    # Upgrade hashes created with an older work factor while we have the password
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(login_data.password)
+        await db.flush()
+        invalidate_user(db, user.id)
+    
     access_token = create_access_token(
         data={"sub": user.email, "user_id": user.id},
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -98,30 +140,46 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change password"""
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect current password")
     
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    # The user may come from the auth cache, so attach it before changing it
+    db.add(current_user)
+    current_user.hashed_password = await get_password_hash_async(password_data.new_password)
     await db.flush()
+    invalidate_user(db, current_user.id)
     return {"message": "Password updated successfully"}
 
 
 @app.post("/api/auth/logout", tags=["Authentication"])
-async def logout(current_user: User = Depends(get_current_active_user)):
-    """Logout current user"""
+async def logout(
+    token: str = Depends(get_bearer_token),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Logout current user by revoking the token used for this request"""
+    revoke_token(token)
     return {"message": "Successfully logged out"}
 
 
 # ==================== USER ROUTES ====================
 
-@app.get("/api/users", response_model=List[UserResponse], tags=["Users"])
+@app.get("/api/users", response_model=PaginatedResponse[UserResponse], tags=["Users"])
 async def get_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Get all users (Admin only)"""
-    result = await db.execute(select(User))
-    return result.scalars().all()
+    """Get users page by page, ordered by id (Admin only)"""
+    query = select(User).order_by(User.id).limit(limit + 1)
+    after = decode_cursor(cursor, (int,))
+    if after:
+        query = query.where(User.id > after[0])
+    
+    result = await db.execute(query)
+    users, has_more = split_page(result.scalars().all(), limit)
+    next_cursor = encode_cursor(users[-1].id) if has_more else None
+    return {"items": users, "next_cursor": next_cursor, "limit": limit}
 
 
 @app.get("/api/users/{user_id}", response_model=UserResponse, tags=["Users"])
@@ -155,10 +213,14 @@ async def update_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    was_active = user.is_active
     for field, value in user_update.model_dump(exclude_unset=True).items():
         setattr(user, field, value)
     
+    if user.role == "teacher" and user.is_active != was_active:
+        await counters.increment(db, {counters.TEACHERS: 1 if user.is_active else -1})
     await db.flush()
+    invalidate_user(db, user.id)
     await db.refresh(user)
     return user
 
@@ -177,47 +239,44 @@ async def create_class(
         db_class.teacher_id = current_user.id
     db.add(db_class)
     await db.flush()
+    await counters.increment(db, {
+        counters.CLASSES: 1,
+        counters.CLASSES_VERSION: 1,
+        counters.teacher_classes_key(db_class.teacher_id): 1
+    })
     await db.refresh(db_class)
     return db_class
 
 
 @app.get("/api/classes", response_model=List[ClassWithStudentCount], tags=["Classes"])
 async def get_classes(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all classes with student count"""
-    # Get classes based on role
-    if current_user.role == "admin":
-        query = select(Class)
-    else:
-        query = select(Class).where(Class.teacher_id == current_user.id)
+    # Teachers only see their own classes, so their copies are tagged per user
+    not_modified = await etags.check(
+        request, response, db, [counters.CLASSES_VERSION, counters.STUDENTS_VERSION],
+        "all" if current_user.role == "admin" else current_user.id
+    )
+    if not_modified:
+        return not_modified
     
-    result = await db.execute(query)
-    classes = result.scalars().all()
+    # Count active students per class in the same grouped query
+    query = (
+        select(*Class.__table__.columns, func.count(Student.id).label("student_count"))
+        .outerjoin(Student, and_(Student.class_id == Class.id, Student.is_active == True))
+        .group_by(Class.id)
+    )
     
-    # Add student count to each class
-    response = []
-    for cls in classes:
-        count_result = await db.execute(
-            select(func.count(Student.id)).where(Student.class_id == cls.id)
-        )
-        student_count = count_result.scalar() or 0
-        
-        class_dict = {
-            "id": cls.id,
-            "name": cls.name,
-            "description": cls.description,
-            "grade_level": cls.grade_level,
-            "academic_year": cls.academic_year,
-            "teacher_id": cls.teacher_id,
-            "created_at": cls.created_at,
-            "updated_at": cls.updated_at,
-            "student_count": student_count
-        }
-        response.append(ClassWithStudentCount(**class_dict))
+    # Get classes based on role
+    if current_user.role != "admin":
+        query = query.where(Class.teacher_id == current_user.id)
     
-    return response
+    result = await db.execute(query)
+    return adapter_response(CLASS_LIST_ADAPTER, result.all(), request, response)
 
 
 @app.get("/api/classes/{class_id}", response_model=ClassResponse, tags=["Classes"])
@@ -247,9 +306,17 @@ async def update_class(
     if not cls:
         raise HTTPException(status_code=404, detail="Class not found")
     
+    old_teacher_id = cls.teacher_id
     for field, value in class_update.model_dump(exclude_unset=True).items():
         setattr(cls, field, value)
     
+    deltas = {counters.CLASSES_VERSION: 1}
+    if cls.teacher_id != old_teacher_id:
+        if old_teacher_id is not None:
+            deltas[counters.teacher_classes_key(old_teacher_id)] = -1
+        if cls.teacher_id is not None:
+            deltas[counters.teacher_classes_key(cls.teacher_id)] = 1
+    await counters.increment(db, deltas)
     await db.flush()
     await db.refresh(cls)
     return cls
@@ -267,6 +334,14 @@ async def delete_class(
     if not cls:
         raise HTTPException(status_code=404, detail="Class not found")
     
+    deltas = {counters.CLASSES: -1, counters.CLASSES_VERSION: 1}
+    if cls.teacher_id is not None:
+        deltas[counters.teacher_classes_key(cls.teacher_id)] = -1
+    await counters.increment(db, deltas)
+    # Explicit as well as ON DELETE CASCADE: SQLite does not enforce foreign
+    # keys, and tables created before the cascade was added lack it
+    await db.execute(delete(AttendanceDailyRollup).where(AttendanceDailyRollup.class_id == class_id))
+    await db.execute(delete(AttendanceReminder).where(AttendanceReminder.class_id == class_id))
     await db.delete(cls)
     return {"message": "Class deleted successfully"}
 
@@ -289,75 +364,118 @@ async def create_student(
     db.add(db_student)
     await db.flush()
     await db.refresh(db_student)
+    await counters.increment(db, {counters.STUDENTS: 1, counters.STUDENTS_VERSION: 1})
     return db_student
 
 
-@app.get("/api/students", response_model=List[StudentWithClass], tags=["Students"])
+@app.post("/api/students/import", response_model=StudentImportResult, tags=["Students"])
+async def import_students(
+    request: Request,
+    dry_run: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Import students from a CSV file or JSON array, reporting rows that could not be imported"""
+    rows = student_import.parse_rows(await request.body(), request.headers.get("content-type", ""))
+    return await student_import.import_students(db, rows, dry_run=dry_run)
+
+
+@app.get("/api/students", response_model=PaginatedResponse[StudentWithClass], tags=["Students"])
 async def get_students(
+    request: Request,
+    response: Response,
     class_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all students with optional filtering"""
-    query = select(Student).where(Student.is_active == True)
+    """Get students page by page, ordered by last name, with optional filtering"""
+    not_modified = await etags.check(
+        request, response, db, [counters.STUDENTS_VERSION, counters.CLASSES_VERSION]
+    )
+    if not_modified:
+        return not_modified
+    
+    # Plain columns validate far faster than instrumented ORM attributes
+    query = (
+        select(*Student.__table__.columns, Class.name.label("class_name"))
+        .outerjoin(Class, Class.id == Student.class_id)
+        .where(Student.is_active == True)
+        .order_by(Student.last_name, Student.id)
+        .limit(limit + 1)
+    )
+    
+    after = decode_cursor(cursor, (str, int))
+    if after:
+        query = query.where(
+            or_(
+                Student.last_name > after[0],
+                and_(Student.last_name == after[0], Student.id > after[1])
+            )
+        )
     
     if class_id:
         query = query.where(Student.class_id == class_id)
     
     if search:
-        search_term = f"%{search}%"
+        tokens = student_search.tokenize(search)
+        if not tokens:
+            return {"items": [], "next_cursor": None, "limit": limit}
         query = query.where(
-            (Student.first_name.ilike(search_term)) |
-            (Student.last_name.ilike(search_term)) |
-            (Student.student_id.ilike(search_term))
+            Student.id.in_(student_search.matching_ids(db.get_bind().dialect.name, tokens))
         )
     
     result = await db.execute(query)
-    students = result.scalars().all()
-    
-    # Fetch class names for all students
-    students_with_class = []
-    for student in students:
-        class_name = None
-        if student.class_id:
-            class_result = await db.execute(select(Class).where(Class.id == student.class_id))
-            cls = class_result.scalar_one_or_none()
-            if cls:
-                class_name = cls.name
-        
-        students_with_class.append(StudentWithClass(
-            **{k: v for k, v in student.__dict__.items() if not k.startswith('_')},
-            class_name=class_name
-        ))
-    
-    return students_with_class
+    students, has_more = split_page(result.all(), limit)
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(students[-1].last_name, students[-1].id)
+    return adapter_response(
+        STUDENT_PAGE_ADAPTER,
+        {"items": students, "next_cursor": next_cursor, "limit": limit},
+        request,
+        response
+    )
+
+
+@app.get("/api/students/search", response_model=List[StudentWithClass], tags=["Students"])
+async def search_students(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(student_search.SEARCH_DEFAULT_LIMIT, ge=1, le=student_search.SEARCH_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Search active students by name or student number prefix, best matches first"""
+    return await student_search.search_students(db, q, limit)
 
 
 @app.get("/api/students/{student_id}", response_model=StudentWithClass, tags=["Students"])
 async def get_student(
+    request: Request,
+    response: Response,
     student_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get student by ID"""
-    result = await db.execute(select(Student).where(Student.id == student_id))
+    not_modified = await etags.check(
+        request, response, db, [counters.STUDENTS_VERSION, counters.CLASSES_VERSION]
+    )
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(
+        select(Student)
+        .options(joinedload(Student.class_ref))
+        .where(Student.id == student_id)
+    )
     student = result.scalar_one_or_none()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    
-    # Get class name
-    class_name = None
-    if student.class_id:
-        class_result = await db.execute(select(Class).where(Class.id == student.class_id))
-        cls = class_result.scalar_one_or_none()
-        if cls:
-            class_name = cls.name
-    
-    return StudentWithClass(
-        **{k: v for k, v in student.__dict__.items() if not k.startswith('_')},
-        class_name=class_name
-    )
+    return student
 
 
 @app.put("/api/students/{student_id}", response_model=StudentResponse, tags=["Students"])
@@ -373,9 +491,14 @@ async def update_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
+    was_active = student.is_active
     for field, value in student_update.model_dump(exclude_unset=True).items():
         setattr(student, field, value)
     
+    deltas = {counters.STUDENTS_VERSION: 1}
+    if student.is_active != was_active:
+        deltas[counters.STUDENTS] = 1 if student.is_active else -1
+    await counters.increment(db, deltas)
     await db.flush()
     await db.refresh(student)
     return student
@@ -393,6 +516,10 @@ async def delete_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
+    deltas = {counters.STUDENTS_VERSION: 1}
+    if student.is_active:
+        deltas[counters.STUDENTS] = -1
+    await counters.increment(db, deltas)
     student.is_active = False
     await db.flush()
     return {"message": "Student deleted successfully"}
@@ -407,110 +534,306 @@ async def create_attendance(
     current_user: User = Depends(get_current_active_user)
 ):
     """Mark attendance for a single student"""
+    # Queue behind any bulk submission for the same class-day
+    await rollups.lock(db, attendance_data.class_id, attendance_data.date)
     db_attendance = Attendance(
         **attendance_data.model_dump(),
         marked_by=current_user.id
     )
     db.add(db_attendance)
-    await db.flush()
+    try:
+        await db.flush()
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Attendance already marked for this student on this date")
+    changes = rollups.status_changes([(None, attendance_data.status.value)])
+    await counters.increment(db, counters.attendance_deltas(attendance_data.date, changes))
+    await rollups.apply(db, attendance_data.class_id, attendance_data.date, changes)
     await db.refresh(db_attendance)
     return db_attendance
 
 
-@app.post("/api/attendance/bulk", tags=["Attendance"])
+@app.post("/api/attendance/bulk", response_model=AttendanceBulkResult, tags=["Attendance"])
 async def create_bulk_attendance(
     bulk_data: AttendanceBulkCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Mark attendance for multiple students at once"""
-    created = []
-    for record in bulk_data.attendance_records:
-        # Check if attendance already exists for this student on this date
-        existing = await db.execute(
-            select(Attendance).where(
-                and_(
-                    Attendance.student_id == record["student_id"],
-                    Attendance.class_id == bulk_data.class_id,
-                    Attendance.date == bulk_data.date
-                )
+    # The last entry wins if a student appears twice in the same batch
+    records = {record.student_id: record for record in bulk_data.attendance_records}
+    if not records:
+        return {"message": "Attendance marked for 0 students", "created": 0, "updated": 0}
+    
+    # Serialize writers for this class-day before reading, or two concurrent
+    # submissions could both see "no row" and count the same records twice
+    await rollups.lock(db, bulk_data.class_id, bulk_data.date)
+    
+    # Statuses being replaced, so counters and rollups can move from old to new
+    existing = await db.execute(
+        select(Attendance.student_id, Attendance.status).where(
+            and_(
+                Attendance.class_id == bulk_data.class_id,
+                Attendance.date == bulk_data.date,
+                Attendance.student_id.in_(records.keys())
             )
         )
-        existing_record = existing.scalar_one_or_none()
-        
-        if existing_record:
-            # Update existing record
-            existing_record.status = record.get("status", "present")
-            existing_record.notes = record.get("notes")
-            existing_record.marked_by = current_user.id
-        else:
-            # Create new record
-            db_attendance = Attendance(
-                student_id=record["student_id"],
-                class_id=bulk_data.class_id,
-                date=bulk_data.date,
-                status=record.get("status", "present"),
-                notes=record.get("notes"),
-                marked_by=current_user.id
-            )
-            db.add(db_attendance)
-        created.append(record["student_id"])
+    )
+    old_statuses = dict(existing.all())
     
-    await db.flush()
-    return {"message": f"Attendance marked for {len(created)} students"}
+    # Insert or update the whole batch in one statement
+    now = datetime.utcnow()
+    insert = dialect_insert(db)
+    stmt = insert(Attendance).values([
+        {
+            "student_id": record.student_id,
+            "class_id": bulk_data.class_id,
+            "date": bulk_data.date,
+            "status": record.status.value,
+            "notes": record.notes,
+            "marked_by": current_user.id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for record in records.values()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id", "class_id", "date"],
+        set_={
+            "status": stmt.excluded.status,
+            "notes": stmt.excluded.notes,
+            "marked_by": stmt.excluded.marked_by,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+    await db.execute(stmt)
+    
+    changes = rollups.status_changes(
+        (old_statuses.get(record.student_id), record.status.value)
+        for record in records.values()
+    )
+    await counters.increment(db, counters.attendance_deltas(bulk_data.date, changes))
+    await rollups.apply(db, bulk_data.class_id, bulk_data.date, changes)
+    
+    created = len(records) - len(old_statuses)
+    return {
+        "message": f"Attendance marked for {len(records)} students",
+        "created": created,
+        "updated": len(records) - created
+    }
 
 
 @app.get("/api/attendance", response_model=List[AttendanceWithStudent], tags=["Attendance"])
 async def get_attendance(
+    request: Request,
+    response: Response,
     class_id: int = Query(...),
     date_param: date = Query(..., alias="date"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get attendance for a class on a specific date"""
+    # Pull the student columns in the same query instead of one lookup per record
     result = await db.execute(
-        select(Attendance).where(
+        select(
+            Attendance.id,
+            Attendance.student_id,
+            Attendance.class_id,
+            Attendance.date,
+            Attendance.status,
+            Attendance.notes,
+            Attendance.marked_by,
+            Attendance.created_at,
+            (Student.first_name + " " + Student.last_name).label("student_name"),
+            Student.student_id.label("student_number")
+        )
+        .join(Student, Student.id == Attendance.student_id)
+        .where(
             and_(
                 Attendance.class_id == class_id,
                 Attendance.date == date_param
             )
         )
     )
-    attendance_records = result.scalars().all()
-    
-    # Enrich with student info
-    response = []
-    for record in attendance_records:
-        student_result = await db.execute(select(Student).where(Student.id == record.student_id))
-        student = student_result.scalar_one_or_none()
-        if student:
-            response.append(AttendanceWithStudent(
-                id=record.id,
-                student_id=record.student_id,
-                class_id=record.class_id,
-                date=record.date,
-                status=record.status,
-                notes=record.notes,
-                marked_by=record.marked_by,
-                created_at=record.created_at,
-                student_name=f"{student.first_name} {student.last_name}",
-                student_number=student.student_id
-            ))
-    
-    return response
-
-
-@app.get("/api/attendance/student/{student_id}", response_model=List[AttendanceResponse], tags=["Attendance"])
+    
+    return adapter_response(ATTENDANCE_LIST_ADAPTER, result.all(), request, response)
+
+
+@app.get("/api/attendance/student/{student_id}", response_model=PaginatedResponse[AttendanceResponse], tags=["Attendance"])
 async def get_student_attendance(
+    request: Request,
+    response: Response,
     student_id: int,
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get attendance history for a specific student"""
+    """Get attendance history for a specific student, newest first.
+    
+    With stream=true every record in the date range is streamed as a plain
+    JSON array and limit/cursor are ignored.
+    """
+    query = (
+        select(*Attendance.__table__.columns)
+        .where(Attendance.student_id == student_id)
+        .order_by(Attendance.date.desc(), Attendance.id.desc())
+    )
+    if date_from:
+        query = query.where(Attendance.date >= date_from)
+    if date_to:
+        query = query.where(Attendance.date <= date_to)
+    
+    if stream:
+        return StreamingResponse(
+            stream_json_array(query, AttendanceResponse),
+            media_type="application/json"
+        )
+    
+    query = query.limit(limit + 1)
+    after = decode_cursor(cursor, (str, int))
+    if after:
+        try:
+            after_date = date.fromisoformat(after[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            or_(
+                Attendance.date < after_date,
+                and_(Attendance.date == after_date, Attendance.id < after[1])
+            )
+        )
+    
+    result = await db.execute(query)
+    records, has_more = split_page(result.all(), limit)
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(records[-1].date.isoformat(), records[-1].id)
+    return adapter_response(
+        ATTENDANCE_PAGE_ADAPTER,
+        {"items": records, "next_cursor": next_cursor, "limit": limit},
+        request,
+        response
+    )
+
+
+# ==================== REPORT ROUTES ====================
+
+@app.get("/api/reports/attendance", response_model=AttendanceReport, tags=["Reports"])
+async def get_attendance_report(
+    class_id: int = Query(...),
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Per-student attendance counts and rates for a class over a date range"""
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    
+    result = await db.execute(select(Class).where(Class.id == class_id))
+    cls = result.scalar_one_or_none()
+    if not cls:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    in_range = and_(
+        Attendance.class_id == class_id,
+        Attendance.date >= date_from,
+        Attendance.date <= date_to
+    )
+    # Days with any attendance taken, from one rollup row per class-day
+    rollup_total = (
+        AttendanceDailyRollup.present + AttendanceDailyRollup.absent +
+        AttendanceDailyRollup.late + AttendanceDailyRollup.excused
+    )
+    total_days = (
+        select(func.count())
+        .where(
+            AttendanceDailyRollup.class_id == class_id,
+            AttendanceDailyRollup.date >= date_from,
+            AttendanceDailyRollup.date <= date_to,
+            rollup_total > 0
+        )
+        .scalar_subquery()
+    )
+    
+    # Every student currently in the class, with their counts from one grouped pass
     result = await db.execute(
-        select(Attendance).where(Attendance.student_id == student_id).order_by(Attendance.date.desc())
+        select(
+            Student.id,
+            Student.student_id,
+            Student.first_name,
+            Student.last_name,
+            *[
+                func.count(Attendance.id).filter(Attendance.status == s).label(s)
+                for s in counters.ATTENDANCE_STATUSES
+            ],
+            func.count(Attendance.id).label("total"),
+            total_days.label("total_days")
+        )
+        .outerjoin(Attendance, and_(Attendance.student_id == Student.id, in_range))
+        .where(Student.class_id == class_id, Student.is_active == True)
+        .group_by(Student.id)
+        .order_by(Student.last_name, Student.first_name, Student.id)
     )
-    return result.scalars().all()
+    rows = result.all()
+    
+    summary = []
+    for row in rows:
+        entry = {
+            "student_id": row.id,
+            "student_number": row.student_id,
+            "student_name": f"{row.first_name} {row.last_name}",
+            "total": row.total
+        }
+        for s in counters.ATTENDANCE_STATUSES:
+            count = getattr(row, s)
+            entry[s] = count
+            entry[f"{s}_rate"] = round(count / row.total, 4) if row.total else 0.0
+        summary.append(entry)
+    
+    return AttendanceReport(
+        class_id=cls.id,
+        class_name=cls.name,
+        date_from=date_from,
+        date_to=date_to,
+        total_students=len(rows),
+        total_days=rows[0].total_days if rows else 0,
+        attendance_summary=summary
+    )
+
+
+@app.get("/api/reports/attendance/daily", response_model=List[AttendanceDailySummary], tags=["Reports"])
+async def get_daily_attendance_report(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    class_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Per-day attendance totals for one class, or the whole school when class_id is omitted"""
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    
+    query = (
+        select(
+            AttendanceDailyRollup.date,
+            *[
+                func.sum(getattr(AttendanceDailyRollup, s)).label(s)
+                for s in rollups.STATUSES
+            ]
+        )
+        .where(AttendanceDailyRollup.date >= date_from, AttendanceDailyRollup.date <= date_to)
+        .group_by(AttendanceDailyRollup.date)
+        .order_by(AttendanceDailyRollup.date)
+    )
+    if class_id is not None:
+        query = query.where(AttendanceDailyRollup.class_id == class_id)
+    
+    result = await db.execute(query)
+    return [row._asdict() for row in result]
 
 
 # ==================== DASHBOARD ROUTES ====================
@@ -521,44 +844,108 @@ async def get_dashboard_stats(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get dashboard statistics"""
-    # Total students
-    student_count = await db.execute(select(func.count(Student.id)).where(Student.is_active == True))
-    total_students = student_count.scalar() or 0
-    
-    # Total classes
+    # Every figure is a maintained counter, read together in one query
     if current_user.role == "admin":
-        class_count = await db.execute(select(func.count(Class.id)))
+        classes_key = counters.CLASSES
     else:
-        class_count = await db.execute(
-            select(func.count(Class.id)).where(Class.teacher_id == current_user.id)
-        )
-    total_classes = class_count.scalar() or 0
+        classes_key = counters.teacher_classes_key(current_user.id)
     
-    # Total teachers
-    teacher_count = await db.execute(
-        select(func.count(User.id)).where(User.role == "teacher", User.is_active == True)
+    days = counters.recent_days(date.today())
+    attendance_keys = [
+        counters.attendance_key(day, status)
+        for day in days for status in counters.ATTENDANCE_STATUSES
+    ]
+    values = await counters.read(
+        db, [counters.STUDENTS, classes_key, counters.TEACHERS] + attendance_keys
     )
-    total_teachers = teacher_count.scalar() or 0
-    
-    # Today's attendance
-    today = date.today()
-    attendance_today = {"present": 0, "absent": 0, "late": 0, "excused": 0}
     
-    for status in ["present", "absent", "late", "excused"]:
-        count_result = await db.execute(
-            select(func.count(Attendance.id)).where(
-                and_(Attendance.date == today, Attendance.status == status)
-            )
-        )
-        attendance_today[status] = count_result.scalar() or 0
+    recent_attendance = [
+        {
+            "date": day.isoformat(),
+            **{
+                status: values[counters.attendance_key(day, status)]
+                for status in counters.ATTENDANCE_STATUSES
+            }
+        }
+        for day in days
+    ]
+    attendance_today = {k: v for k, v in recent_attendance[0].items() if k != "date"}
     
     return DashboardStats(
-        total_students=total_students,
-        total_classes=total_classes,
-        total_teachers=total_teachers,
+        total_students=values[counters.STUDENTS],
+        total_classes=values[classes_key],
+        total_teachers=values[counters.TEACHERS],
         attendance_today=attendance_today,
-        recent_attendance=[]
+        recent_attendance=recent_attendance
+    )
+
+
+# ==================== EXPORT ROUTES ====================
+
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
+
+
+def export_response(query, schema, export_format: str, name: str) -> StreamingResponse:
+    """Stream a query as a downloadable CSV or NDJSON file"""
+    stream, media_type = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        stream(query, schema),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'}
+    )
+
+
+@app.get("/api/export/students", tags=["Export"])
+async def export_students(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    class_id: Optional[int] = Query(None),
+    include_inactive: bool = Query(False),
+    current_user: User = Depends(get_admin_user)
+):
+    """Export students as CSV or NDJSON, streamed in constant memory (Admin only)"""
+    query = select(Student).options(joinedload(Student.class_ref)).order_by(Student.id)
+    if class_id:
+        query = query.where(Student.class_id == class_id)
+    if not include_inactive:
+        query = query.where(Student.is_active == True)
+    return export_response(query, StudentWithClass, export_format, "students")
+
+
+@app.get("/api/export/attendance", tags=["Export"])
+async def export_attendance(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    class_id: Optional[int] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    current_user: User = Depends(get_admin_user)
+):
+    """Export attendance records as CSV or NDJSON, streamed in constant memory (Admin only)"""
+    query = (
+        select(
+            Attendance.id,
+            Attendance.student_id,
+            Attendance.class_id,
+            Attendance.date,
+            Attendance.status,
+            Attendance.notes,
+            Attendance.marked_by,
+            Attendance.created_at,
+            Student.student_id.label("student_number"),
+            (Student.first_name + " " + Student.last_name).label("student_name")
+        )
+        .join(Student, Student.id == Attendance.student_id)
+        .order_by(Attendance.id)
     )
+    if class_id:
+        query = query.where(Attendance.class_id == class_id)
+    if date_from:
+        query = query.where(Attendance.date >= date_from)
+    if date_to:
+        query = query.where(Attendance.date <= date_to)
+    return export_response(query, AttendanceWithStudent, export_format, "attendance")
 
 
 # ==================== NOTIFICATION ROUTES ====================
@@ -578,6 +965,66 @@ async def get_notifications(
     return result.scalars().all()
 
 
+@app.post("/api/notifications", response_model=NotificationResponse, tags=["Notifications"])
+async def create_notification(
+    notification_data: NotificationCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Send a notification to a user (Admin only)"""
+    result = await db.execute(select(User.id).where(User.id == notification_data.user_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    created = await notifications.create(db, [notification_data.model_dump()])
+    return created[0]
+
+
+@app.get("/api/notifications/unread_count", response_model=UnreadCount, tags=["Notifications"])
+async def get_unread_notification_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Number of unread notifications, read from a maintained counter"""
+    return {"unread": await notifications.unread_count(db, current_user.id)}
+
+
+@app.get("/api/notifications/stream", tags=["Notifications"])
+async def stream_notifications(
+    token: str = Depends(get_bearer_token),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Live notifications as Server-Sent Events.
+    
+    Sends an unread_count event on connect, then a notification event for
+    each new notification and a read event when notifications are marked read.
+    The stream ends after logout or once the user is deactivated.
+    """
+    # Hand the connection back to the pool before the long-lived response starts
+    await db.commit()
+    user_id = current_user.id
+    return StreamingResponse(
+        notifications.event_stream(user_id, lambda: still_authorized(token, user_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.put("/api/notifications/read", response_model=NotificationMarkReadResult, tags=["Notifications"])
+async def mark_notifications_read(
+    data: NotificationMarkRead,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark several notifications, or all of them with all=true, as read"""
+    if not data.all and not data.ids:
+        raise HTTPException(status_code=400, detail="Provide notification ids or all=true")
+    
+    updated = await notifications.mark_read(db, current_user.id, None if data.all else data.ids)
+    return {"updated": len(updated)}
+
+
 @app.put("/api/notifications/{notification_id}/read", tags=["Notifications"])
 async def mark_notification_read(
     notification_id: int,
@@ -585,16 +1032,14 @@ async def mark_notification_read(
     current_user: User = Depends(get_current_active_user)
 ):
     """Mark notification as read"""
-    result = await db.execute(
-        select(Notification).where(
-            and_(Notification.id == notification_id, Notification.user_id == current_user.id)
+    if not await notifications.mark_read(db, current_user.id, [notification_id]):
+        # Nothing changed: either already read or not this user's notification
+        result = await db.execute(
+            select(Notification.id).where(
+                and_(Notification.id == notification_id, Notification.user_id == current_user.id)
+            )
         )
-    )
-    notification = result.scalar_one_or_none()
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    
-    notification.is_read = True
-    await db.flush()
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Notification not found")
     return {"message": "Notification marked as read"}
 
@@ -1,10 +1,19 @@
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+import asyncio
+import hashlib
+import heapq
+import time
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app.cache import TTLCache
+from app.config import settings
+from app import db as database
 from app.db import get_db
 from app.models import User
 from app.schemas import TokenData
@@ -14,6 +23,61 @@ SECRET_KEY = "your-secret-key-change-in-production-make-it-long-and-random"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 
 
+# Authenticated users are cached by id so most requests skip the user lookup.
+# Writes invalidate entries explicitly; the TTL bounds staleness across workers.
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL_SECONDS = 60
+
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+_user_columns = [attr.key for attr in inspect(User).column_attrs]
+
+# bcrypt runs in a dedicated thread pool so hashing never blocks the event loop.
+# Once HASH_MAX_PENDING calls are running or queued, new ones fail fast with 503.
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+HASH_WORKERS = settings.hash_workers
+HASH_MAX_PENDING = settings.hash_max_pending
+
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_pending = 0
+
+# Verified token claims are cached by token digest (never past the token's exp),
+# so repeat requests with the same token skip signature verification.
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 300
+
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+class TokenRevocationList:
+    """Digests of logged-out tokens, each kept until the token would have expired.
+
+    This one lives in process memory. Assign a replacement with the same
+    revoke/is_revoked methods to auth.revoked_tokens to share revocations
+    between workers.
+    """
+
+    def __init__(self):
+        self._revoked = set()
+        self._expiry_heap = []
+
+    def revoke(self, digest: str, expires_at: float) -> None:
+        self._prune()
+        if digest not in self._revoked:
+            self._revoked.add(digest)
+            heapq.heappush(self._expiry_heap, (expires_at, digest))
+
+    def is_revoked(self, digest: str) -> bool:
+        return digest in self._revoked
+
+    def _prune(self) -> None:
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, digest = heapq.heappop(self._expiry_heap)
+            self._revoked.discard(digest)
+
+
+revoked_tokens = TokenRevocationList()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
@@ -23,10 +87,45 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the stored hash uses a lower work factor than BCRYPT_ROUNDS
+
+    Stronger hashes are left alone, so lowering BCRYPT_ROUNDS never weakens them.
+    """
+    try:
+        return int(hashed_password.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_hashing(func, *args):
+    global _hash_pending
+    if _hash_pending >= HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -38,15 +137,70 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-    )
+def _cache_user(user: User) -> None:
+    _user_cache.set(user.id, {key: getattr(user, key) for key in _user_columns})
+
+
+def _get_cached_user(user_id: Optional[int]) -> Optional[User]:
+    values = _user_cache.get(user_id) if user_id is not None else None
+    if values is None:
+        return None
+    # A fresh detached instance per request, so callers can't mutate the cache
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user(db: AsyncSession, user_id: int) -> None:
+    """Drop a cached user now and again once the session's changes are committed"""
+    _user_cache.pop(user_id)
+    event.listen(db.sync_session, "after_commit", lambda session: _user_cache.pop(user_id), once=True)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def decode_access_token(token: str) -> Optional[TokenData]:
+    """Return the token's claims, or None if it is invalid, expired or revoked"""
+    digest = _token_digest(token)
+    if revoked_tokens.is_revoked(digest):
+        return None
+    
+    token_data = _token_cache.get(digest)
+    if token_data is not None:
+        return token_data
     
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    token_data = TokenData(email=email, user_id=payload.get("user_id"), exp=payload.get("exp"))
+    
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if token_data.exp is not None:
+        ttl = min(ttl, token_data.exp - time.time())
+    if ttl > 0:
+        _token_cache.set(digest, token_data, ttl=ttl)
+    return token_data
+
+
+def revoke_token(token: str) -> None:
+    """Make a token unusable for the rest of its lifetime"""
+    token_data = decode_access_token(token)
+    digest = _token_digest(token)
+    _token_cache.pop(digest)
+    if token_data is not None:
+        expires_at = token_data.exp
+        if expires_at is None:
+            expires_at = time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        revoked_tokens.revoke(digest, expires_at)
+
+
+async def get_bearer_token(authorization: Optional[str] = Header(None)) -> str:
     if not authorization:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,28 +215,57 @@ async def get_current_user(
             detail="Invalid authorization header format. Use: Bearer <token>",
         )
     
-    token = parts[1]
+    return parts[1]
+
+
+async def get_current_user(
+    token: str = Depends(get_bearer_token),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        user_id: int = payload.get("user_id")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email, user_id=user_id)
-    except JWTError:
+    token_data = decode_access_token(token)
+    if token_data is None:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.email == token_data.email))
-    user = result.scalar_one_or_none()
+    user = _get_cached_user(token_data.user_id)
+    if user is None or user.email != token_data.email:
+        result = await db.execute(select(User).where(User.email == token_data.email))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise credentials_exception
+        _cache_user(user)
     
-    if user is None:
-        raise credentials_exception
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 
+async def still_authorized(token: str, user_id: int) -> bool:
+    """Whether a token accepted earlier is still good: not revoked or expired, user still active
+
+    For long-lived connections that authenticated once. Uses the user cache,
+    so it only queries the database once the cached entry has expired or been
+    invalidated.
+    """
+    token_data = decode_access_token(token)
+    if token_data is None:
+        return False
+    
+    user = _get_cached_user(user_id)
+    if user is None:
+        async with database.async_session_maker() as session:
+            result = await session.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
+        if user is None:
+            return False
+        _cache_user(user)
+    return user.is_active and user.email == token_data.email
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
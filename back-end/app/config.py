@@ -0,0 +1,69 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _normalize_database_url(url: str) -> str:
+    # Accept the plain postgres:// URLs most hosts hand out and use the async driver
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+class Settings:
+    """Runtime configuration, read from environment variables"""
+
+    def __init__(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_url = f"sqlite+aiosqlite:///{os.path.join(project_root, 'School.db')}"
+
+        self.database_url = _normalize_database_url(os.getenv("DATABASE_URL", default_url))
+        self.database_echo = _env_bool("DATABASE_ECHO", False)
+
+        # Connection pool (ignored for in-memory SQLite)
+        self.pool_size = _env_int("DATABASE_POOL_SIZE", 10)
+        self.max_overflow = _env_int("DATABASE_MAX_OVERFLOW", 20)
+        self.pool_timeout = _env_int("DATABASE_POOL_TIMEOUT", 30)
+        self.pool_recycle = _env_int("DATABASE_POOL_RECYCLE", 1800)
+
+        # SQLite pragmas applied to every new connection
+        self.sqlite_journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+        self.sqlite_synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+        self.sqlite_busy_timeout_ms = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+        self.sqlite_cache_size_kb = _env_int("SQLITE_CACHE_SIZE_KB", 64 * 1024)
+        self.sqlite_mmap_size = _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+
+        # Password hashing: bcrypt work factor and the thread pool it runs in;
+        # hashing requests beyond HASH_MAX_PENDING are rejected with 503
+        self.bcrypt_rounds = _env_int("BCRYPT_ROUNDS", 12)
+        self.hash_workers = _env_int("HASH_WORKERS", 4)
+        self.hash_max_pending = _env_int("HASH_MAX_PENDING", 64)
+
+        # Responses at least this large are gzip/brotli compressed when the client accepts it
+        self.compression_minimum_size = _env_int("COMPRESSION_MINIMUM_SIZE", 1024)
+
+        # Daily reminder to teachers whose classes have no attendance yet (server local time)
+        self.attendance_reminders = _env_bool("ATTENDANCE_REMINDERS", True)
+        self.attendance_reminder_time = os.getenv("ATTENDANCE_REMINDER_TIME", "10:00")
+        self.attendance_reminder_days = os.getenv("ATTENDANCE_REMINDER_DAYS", "mon,tue,wed,thu,fri")
+
+        # Read notifications older than this many days are deleted daily (0 keeps them forever)
+        self.notification_retention_days = _env_int("NOTIFICATION_RETENTION_DAYS", 90)
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.database_url.startswith("sqlite")
+
+
+settings = Settings()
@@ -0,0 +1,121 @@
+"""Maintained counters for the dashboard, ETag versions and unread notifications
+
+Each counter is one row in the counters table, updated by upserting deltas in
+the writer's transaction. That makes a counter row a shared hot spot: every
+attendance write in the school on a given day updates the same
+attendance:<day>:<status> rows, so during the morning burst of submissions
+(see create_bulk_attendance) those writers serialize on them until commit.
+increment locks rows in name order so concurrent writers cannot deadlock.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Union
+
+from sqlalchemy import select, func, delete
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db import dialect_insert
+from app.models import User, Class, Student, Attendance, Notification, Counter, AttendanceStatus
+
+
+STUDENTS = "students"
+CLASSES = "classes"
+TEACHERS = "teachers"
+
+# Bumped on every write to the table; used to build ETags (see app.etags)
+VERSION_PREFIX = "version:"
+CLASSES_VERSION = VERSION_PREFIX + "classes"
+STUDENTS_VERSION = VERSION_PREFIX + "students"
+
+UNREAD_NOTIFICATIONS_PREFIX = "notifications:unread:"
+
+ATTENDANCE_STATUSES = [s.value for s in AttendanceStatus]
+RECENT_ATTENDANCE_DAYS = 7
+
+
+def teacher_classes_key(teacher_id: int) -> str:
+    return f"classes:teacher:{teacher_id}"
+
+
+def attendance_key(day: date, status: str) -> str:
+    return f"attendance:{day.isoformat()}:{status}"
+
+
+def unread_notifications_key(user_id: int) -> str:
+    return f"{UNREAD_NOTIFICATIONS_PREFIX}{user_id}"
+
+
+async def increment(db: Union[AsyncSession, AsyncConnection], deltas: Dict[str, int]) -> None:
+    """Apply counter deltas in the caller's transaction with one upsert"""
+    # Sorted so every transaction locks counter rows in the same order; on
+    # PostgreSQL two writers taking the same rows in opposite orders deadlock
+    rows = sorted(
+        ({"name": name, "value": delta} for name, delta in deltas.items() if delta),
+        key=lambda row: row["name"]
+    )
+    if not rows:
+        return
+    insert = dialect_insert(db)
+    stmt = insert(Counter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": Counter.value + stmt.excluded.value}
+    )
+    await db.execute(stmt)
+
+
+async def read(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """Read several counters at once; missing counters read as 0"""
+    names = list(names)
+    result = await db.execute(select(Counter.name, Counter.value).where(Counter.name.in_(names)))
+    values = dict.fromkeys(names, 0)
+    values.update({name: value for name, value in result})
+    return values
+
+
+def attendance_deltas(day: date, changes: Dict[str, int]) -> Dict[str, int]:
+    """Counter deltas for per-status changes (see rollups.status_changes) on one day"""
+    return {attendance_key(day, status): delta for status, delta in changes.items()}
+
+
+def recent_days(today: date) -> List[date]:
+    """The days covered by the dashboard's recent attendance, newest first"""
+    return [today - timedelta(days=i) for i in range(RECENT_ATTENDANCE_DAYS)]
+
+
+async def rebuild(db: Union[AsyncSession, AsyncConnection]) -> None:
+    """Recompute every counter from the source tables, keeping the table versions"""
+    deltas: Dict[str, int] = {}
+
+    result = await db.execute(select(func.count(Student.id)).where(Student.is_active == True))
+    deltas[STUDENTS] = result.scalar() or 0
+
+    result = await db.execute(
+        select(func.count(User.id)).where(User.role == "teacher", User.is_active == True)
+    )
+    deltas[TEACHERS] = result.scalar() or 0
+
+    result = await db.execute(select(Class.teacher_id, func.count(Class.id)).group_by(Class.teacher_id))
+    for teacher_id, count in result:
+        deltas[CLASSES] = deltas.get(CLASSES, 0) + count
+        if teacher_id is not None:
+            deltas[teacher_classes_key(teacher_id)] = count
+
+    result = await db.execute(
+        select(Attendance.date, Attendance.status, func.count(Attendance.id))
+        .group_by(Attendance.date, Attendance.status)
+    )
+    for day, status, count in result:
+        deltas[attendance_key(day, status)] = count
+
+    result = await db.execute(
+        select(Notification.user_id, func.count(Notification.id))
+        .where(Notification.is_read == False)
+        .group_by(Notification.user_id)
+    )
+    for user_id, count in result:
+        deltas[unread_notifications_key(user_id)] = count
+
+    # Versions cannot be derived from the tables; restarting them could revive old ETags
+    await db.execute(delete(Counter).where(~Counter.name.startswith(VERSION_PREFIX)))
+    await increment(db, deltas)
+
@@ -1,15 +1,42 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
-import os
+from typing import AsyncGenerator, Optional, Union
 
-# Use absolute path to ensure database persists across reloads
-DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(DATABASE_DIR)
-DATABASE_PATH = os.path.join(PROJECT_ROOT, "School.db")
-DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+from app.config import settings
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    # A negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+def make_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create an engine with the configured pool and, for SQLite, connection pragmas"""
+    url = url or settings.database_url
+    kwargs = {"echo": settings.database_echo}
+    if ":memory:" not in url:
+        kwargs.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=not url.startswith("sqlite"),
+        )
+    engine = create_async_engine(url, **kwargs)
+    if url.startswith("sqlite"):
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+engine = make_engine()
 
 async_session_maker = async_sessionmaker(
     engine, 
@@ -31,6 +58,14 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def dialect_insert(session: Union[AsyncSession, AsyncConnection]):
+    """Return the insert() construct supporting ON CONFLICT for the session's (or connection's) dialect"""
+    bind = session if isinstance(session, AsyncConnection) else session.get_bind()
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
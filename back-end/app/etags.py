@@ -0,0 +1,55 @@
+"""Weak ETags for read-mostly endpoints
+
+An ETag is built from the version counters of every table a response reads
+(see counters.CLASSES_VERSION / STUDENTS_VERSION), which the write routes bump
+in the same transaction as the change. Checking If-None-Match therefore costs
+one primary key lookup on counters, and a 304 skips loading and serializing
+the rows entirely. MessagePack copies get their own tags.
+"""
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import counters, serialization
+
+
+# Clients may keep the body but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(versions: Iterable[int], *scope: Any) -> str:
+    return 'W/"' + "-".join(str(part) for part in (*versions, *scope)) + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def matches(request: Request, etag: str) -> bool:
+    """Weak comparison against the If-None-Match header"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+async def check(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    versions: Iterable[str],
+    *scope: Any
+) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current, else tag the response"""
+    names = list(versions)
+    values = await counters.read(db, names)
+    if serialization.negotiate(request) == serialization.MSGPACK:
+        scope += ("msgpack",)
+    etag = make_etag((values[name] for name in names), *scope)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if matches(request, etag):
+        return Response(status_code=304, headers={**headers, "Vary": "Accept"})
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,209 @@
+"""Versioned schema migrations for existing databases
+
+create_all only creates missing tables, so schema changes to tables that
+already exist (new indexes, constraints) are shipped here as numbered
+migrations. Each runs once and is recorded in schema_migrations.
+
+Applied automatically at startup, or from the back-end directory with:
+    python -m app.migrations [upgrade|status]
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Awaitable, Callable, List, NamedTuple
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, cast, delete, func, insert, literal, select, text
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.db import engine as default_engine, init_db
+from app import counters, rollups
+from app.models import Attendance, AttendanceDailyRollup, AttendanceReminder, Class, Counter, Notification, Student
+from app.search import PG_SEARCH_EXPRESSION
+
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[AsyncConnection], Awaitable[None]]
+
+
+def _create_indexes(*indexes):
+    async def apply(conn: AsyncConnection) -> None:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+    return apply
+
+
+def _index(table, name):
+    return next(index for index in table.indexes if index.name == name)
+
+
+async def _unique_attendance(conn: AsyncConnection) -> None:
+    # Keep the newest record of any duplicated student/class/day before adding the index
+    # Counters still include the removed rows until migration 6 rebuilds them
+    await conn.execute(text(
+        "DELETE FROM attendance WHERE id NOT IN "
+        "(SELECT MAX(id) FROM attendance GROUP BY student_id, class_id, date)"
+    ))
+    await _create_indexes(_index(Attendance.__table__, "uq_attendance_student_class_date"))(conn)
+
+
+_SQLITE_STUDENT_SEARCH = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        first_name, last_name, student_id,
+        content='students', content_rowid='id', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts(rowid, first_name, last_name, student_id)
+        VALUES (new.id, new.first_name, new.last_name, new.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, first_name, last_name, student_id)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_update
+    AFTER UPDATE OF first_name, last_name, student_id ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, first_name, last_name, student_id)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.student_id);
+        INSERT INTO students_fts(rowid, first_name, last_name, student_id)
+        VALUES (new.id, new.first_name, new.last_name, new.student_id);
+    END
+    """,
+    "INSERT INTO students_fts(students_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_STUDENT_SEARCH = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_students_search_trgm ON students "
+    f"USING gin (({PG_SEARCH_EXPRESSION}) gin_trgm_ops)",
+]
+
+
+async def _student_search_index(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        statements = _POSTGRES_STUDENT_SEARCH
+    else:
+        statements = _SQLITE_STUDENT_SEARCH
+    for statement in statements:
+        await conn.execute(text(statement))
+
+
+async def _backfill_attendance_rollup(conn: AsyncConnection) -> None:
+    await rollups.rebuild(conn)
+
+
+async def _backfill_unread_notifications(conn: AsyncConnection) -> None:
+    prefix = counters.UNREAD_NOTIFICATIONS_PREFIX
+    await conn.execute(delete(Counter).where(Counter.name.startswith(prefix)))
+    unread = (
+        select(literal(prefix) + cast(Notification.user_id, String), func.count(Notification.id))
+        .where(Notification.is_read == False)
+        .group_by(Notification.user_id)
+    )
+    await conn.execute(insert(Counter).from_select(["name", "value"], unread))
+
+
+async def _backfill_counters(conn: AsyncConnection) -> None:
+    # Unconditional: a table that already has some counters (unread counts
+    # written by a reminder run, say) may still be missing all the others
+    await counters.rebuild(conn)
+
+
+async def _remove_orphaned_class_days(conn: AsyncConnection) -> None:
+    # delete_class left these behind for deleted classes
+    for model in (AttendanceDailyRollup, AttendanceReminder):
+        await conn.execute(delete(model).where(~model.class_id.in_(select(Class.id))))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Unique attendance per student, class and day", _unique_attendance),
+    Migration(2, "Composite indexes for attendance, student and notification queries", _create_indexes(
+        _index(Attendance.__table__, "ix_attendance_class_date"),
+        _index(Attendance.__table__, "ix_attendance_student_date"),
+        _index(Attendance.__table__, "ix_attendance_date_status"),
+        _index(Student.__table__, "ix_students_class_active"),
+        _index(Student.__table__, "ix_students_active_name"),
+        _index(Notification.__table__, "ix_notifications_user_created"),
+    )),
+    Migration(3, "Student search index (FTS5 on SQLite, trigram on PostgreSQL)", _student_search_index),
+    Migration(4, "Backfill attendance_daily_rollup", _backfill_attendance_rollup),
+    Migration(5, "Backfill unread notification counters", _backfill_unread_notifications),
+    Migration(6, "Backfill dashboard and notification counters", _backfill_counters),
+    Migration(7, "Remove rollup and reminder rows of deleted classes", _remove_orphaned_class_days),
+]
+
+
+async def applied_versions(conn: AsyncConnection) -> set:
+    await conn.run_sync(lambda sync_conn: schema_migrations.create(sync_conn, checkfirst=True))
+    result = await conn.execute(select(schema_migrations.c.version))
+    return set(result.scalars())
+
+
+async def upgrade(engine: AsyncEngine = default_engine) -> List[int]:
+    """Apply pending migrations in order, each in its own transaction"""
+    async with engine.begin() as conn:
+        done = await applied_versions(conn)
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        async with engine.begin() as conn:
+            await migration.apply(conn)
+            await conn.execute(schema_migrations.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.utcnow()
+            ))
+        applied.append(migration.version)
+    return applied
+
+
+async def prepare_database() -> List[int]:
+    """Create missing tables and apply pending migrations, as the app does at startup
+
+    Anything that writes to the database outside the app (the one-shot CLIs)
+    calls this first, so it never writes to a schema or counters table that
+    has not been upgraded yet.
+    """
+    await init_db()
+    return await upgrade()
+
+
+async def _main(command: str) -> None:
+    if command == "upgrade":
+        applied = await prepare_database()
+        print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+    elif command == "status":
+        async with default_engine.begin() as conn:
+            done = await applied_versions(conn)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in done else "pending"
+            print(f"{migration.version:>4}  {state:<8} {migration.description}")
+    else:
+        raise SystemExit(f"Unknown command: {command}")
+    await default_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "upgrade"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -52,6 +52,15 @@ class Class(Base):
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_class_active", "class_id", "is_active"),
+        # Roster ordering for get_students, limited to the rows it can return
+        Index(
+            "ix_students_active_name", "last_name", "id",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(String(50), unique=True, index=True, nullable=False)
@@ -74,9 +83,20 @@ class Student(Base):
     class_ref = relationship("Class", back_populates="students")
     attendance_records = relationship("Attendance", back_populates="student")
 
+    @property
+    def class_name(self):
+        # Only safe to read when class_ref was eager loaded with the student
+        return self.class_ref.name if self.class_ref else None
+
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        Index("uq_attendance_student_class_date", "student_id", "class_id", "date", unique=True),
+        Index("ix_attendance_class_date", "class_id", "date"),
+        Index("ix_attendance_student_date", "student_id", "date"),
+        Index("ix_attendance_date_status", "date", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -94,6 +114,9 @@ class Attendance(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -102,3 +125,30 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     notification_type = Column(String(50), nullable=True)  # attendance_reminder, etc.
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    name = Column(String(100), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class AttendanceDailyRollup(Base):
+    __tablename__ = "attendance_daily_rollup"
+
+    class_id = Column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+
+class AttendanceReminder(Base):
+    """Class days an attendance reminder was sent for, so each is sent once"""
+    __tablename__ = "attendance_reminders"
+
+    class_id = Column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
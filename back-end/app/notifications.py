@@ -0,0 +1,159 @@
+"""Notification delivery: creation, unread counters and live event streams
+
+Every notification is created through create(), which inserts the rows with
+one statement, bumps the per-user unread counters in the same transaction and
+publishes the new rows to the user's open /api/notifications/stream
+connections once the transaction commits.
+
+The broker lives in process memory, so a stream only hears about writes made
+by the same worker. Assign a replacement with the same subscribe/unsubscribe/
+publish methods to notifications.broker to fan out across workers.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import counters, db as database
+from app.models import Notification
+from app.schemas import NotificationResponse
+
+
+# Comment lines keep idle connections open through proxies and reveal dead clients
+HEARTBEAT_SECONDS = 15
+# Events waiting for a slow stream beyond this are dropped for that stream
+STREAM_QUEUE_SIZE = 100
+
+
+class NotificationBroker:
+    """Fan-out of notification events to each user's open streams"""
+
+    def __init__(self, queue_size: int = STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._streams: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._streams[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        streams = self._streams.get(user_id)
+        if streams is None:
+            return
+        streams.discard(queue)
+        if not streams:
+            del self._streams[user_id]
+
+    def publish(self, user_id: int, name: str, data: Any) -> None:
+        for queue in self._streams.get(user_id, ()):
+            try:
+                queue.put_nowait((name, data))
+            except asyncio.QueueFull:
+                pass
+
+    def stream_count(self) -> int:
+        return sum(len(streams) for streams in self._streams.values())
+
+
+broker = NotificationBroker()
+
+
+def publish_after_commit(db: AsyncSession, events: Iterable[Tuple[int, str, Any]]) -> None:
+    """Publish (user_id, name, data) events once the session's changes are committed"""
+    events = list(events)
+    if not events:
+        return
+
+    def deliver(session):
+        for user_id, name, data in events:
+            broker.publish(user_id, name, data)
+
+    event.listen(db.sync_session, "after_commit", deliver, once=True)
+
+
+async def create(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Notification]:
+    """Insert notifications (dicts of Notification columns) with a single statement"""
+    if not rows:
+        return []
+    result = await db.scalars(insert(Notification).returning(Notification), rows)
+    created = list(result)
+
+    unread: Dict[str, int] = defaultdict(int)
+    for notification in created:
+        unread[counters.unread_notifications_key(notification.user_id)] += 1
+    await counters.increment(db, unread)
+
+    publish_after_commit(db, (
+        (
+            notification.user_id,
+            "notification",
+            NotificationResponse.model_validate(notification).model_dump(mode="json")
+        )
+        for notification in created
+    ))
+    return created
+
+
+async def mark_read(db: AsyncSession, user_id: int, ids: Optional[List[int]] = None) -> List[int]:
+    """Mark the user's unread notifications in ids (all of them if None) read with one UPDATE
+
+    Returns the ids that changed; the unread counter drops by that many.
+    """
+    stmt = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+        .values(is_read=True)
+        .returning(Notification.id)
+    )
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+    result = await db.execute(stmt)
+    updated = list(result.scalars())
+    if updated:
+        await counters.increment(db, {counters.unread_notifications_key(user_id): -len(updated)})
+        publish_after_commit(db, [(user_id, "read", {"ids": updated})])
+    return updated
+
+
+async def unread_count(db: AsyncSession, user_id: int) -> int:
+    key = counters.unread_notifications_key(user_id)
+    values = await counters.read(db, [key])
+    return values[key]
+
+
+def format_event(name: str, data: Any) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(user_id: int, authorized: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+    """Server-Sent Events for one connection: the unread count, then each new event
+
+    The queue is subscribed before the count is read, so nothing committed in
+    between is lost. authorized() is checked at least every HEARTBEAT_SECONDS
+    and the stream ends once it returns False (token revoked or expired,
+    user deactivated).
+    """
+    queue = broker.subscribe(user_id)
+    try:
+        async with database.async_session_maker() as session:
+            unread = await unread_count(session, user_id)
+        yield format_event("unread_count", {"unread": unread})
+        
+        loop = asyncio.get_running_loop()
+        checked_at = loop.time()
+        while True:
+            try:
+                name, data = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                name = None
+            if loop.time() - checked_at >= HEARTBEAT_SECONDS:
+                if not await authorized():
+                    return
+                checked_at = loop.time()
+            yield ": keep-alive\n\n" if name is None else format_event(name, data)
+    finally:
+        broker.unsubscribe(user_id, queue)
@@ -0,0 +1,129 @@
+"""Daily attendance reminders for teachers
+
+send_reminders finds every class whose teacher has not marked attendance for
+the day with one anti-join, claims those class days in attendance_reminders
+so each is reminded at most once (even with several workers running the
+job), and creates the teachers' notifications in one batched insert.
+
+The app runs it every ATTENDANCE_REMINDER_DAYS at ATTENDANCE_REMINDER_TIME.
+To run it once by hand, from the back-end directory:
+    python -m app.reminders [--date YYYY-MM-DD]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import db as database, migrations, notifications
+from app.config import settings
+from app.db import dialect_insert
+from app.models import Attendance, AttendanceReminder, Class, User
+
+
+REMINDER_TYPE = "attendance_reminder"
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+logger = logging.getLogger(__name__)
+
+
+def parse_days(value: str) -> Set[int]:
+    """Weekday numbers (Monday is 0) from a comma separated list such as mon,tue,wed"""
+    return {WEEKDAYS.index(day.strip().lower()[:3]) for day in value.split(",") if day.strip()}
+
+
+async def send_reminders(db: AsyncSession, day: date) -> int:
+    """Notify the teacher of every class without attendance on day; returns the number sent"""
+    attendance_taken = (
+        select(Attendance.id)
+        .where(Attendance.class_id == Class.id, Attendance.date == day)
+        .exists()
+    )
+    already_reminded = (
+        select(AttendanceReminder.class_id)
+        .where(AttendanceReminder.class_id == Class.id, AttendanceReminder.date == day)
+        .exists()
+    )
+    result = await db.execute(
+        select(Class.id, Class.name, Class.teacher_id)
+        .join(User, User.id == Class.teacher_id)
+        .where(User.is_active == True, ~attendance_taken, ~already_reminded)
+    )
+    pending = result.all()
+    if not pending:
+        return 0
+
+    # Claim the class days first; a concurrent run that got there earlier wins
+    insert = dialect_insert(db)
+    result = await db.execute(
+        insert(AttendanceReminder)
+        .values([{"class_id": class_id, "date": day, "created_at": datetime.utcnow()} for class_id, _, _ in pending])
+        .on_conflict_do_nothing()
+        .returning(AttendanceReminder.class_id)
+    )
+    claimed = set(result.scalars())
+
+    created = await notifications.create(db, [
+        {
+            "user_id": teacher_id,
+            "title": "Attendance reminder",
+            "message": f"Attendance for {name} on {day.isoformat()} has not been marked yet.",
+            "notification_type": REMINDER_TYPE
+        }
+        for class_id, name, teacher_id in pending
+        if class_id in claimed
+    ])
+    return len(created)
+
+
+async def run_once(day: date) -> int:
+    async with database.async_session_maker() as session:
+        sent = await send_reminders(session, day)
+        await session.commit()
+    return sent
+
+
+def next_run(now: datetime, at: time, days: Set[int]) -> datetime:
+    candidate = datetime.combine(now.date(), at)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() not in days:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+async def run_daily() -> None:
+    """Send reminders on every scheduled day at the configured time, until cancelled"""
+    at = time.fromisoformat(settings.attendance_reminder_time)
+    days = parse_days(settings.attendance_reminder_days)
+    if not days:
+        return
+
+    now = datetime.now()
+    # Catch up after a restart past today's reminder time; runs are idempotent
+    due = now.weekday() in days and now.time() >= at
+    while True:
+        if due:
+            try:
+                await run_once(date.today())
+            except Exception:
+                logger.exception("Attendance reminder run failed")
+        now = datetime.now()
+        await asyncio.sleep((next_run(now, at, days) - now).total_seconds())
+        due = True
+
+
+async def _main(day: date) -> None:
+    await migrations.prepare_database()
+    sent = await run_once(day)
+    await database.engine.dispose()
+    print(f"Sent {sent} attendance reminders for {day.isoformat()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remind teachers whose classes have no attendance for a day")
+    parser.add_argument("--date", dest="day", type=date.fromisoformat, default=date.today())
+    asyncio.run(_main(parser.parse_args().day))
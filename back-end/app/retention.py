@@ -0,0 +1,83 @@
+"""Retention pruning for read notifications
+
+Read notifications older than NOTIFICATION_RETENTION_DAYS are deleted in
+batches of PRUNE_BATCH_SIZE, each in its own short transaction, so the job
+never holds SQLite's write lock for long and requests keep writing between
+batches. Unread notifications are never pruned, so unread counters are not
+affected.
+
+The app prunes once a day while NOTIFICATION_RETENTION_DAYS is above zero.
+To prune by hand, from the back-end directory:
+    python -m app.retention [--days N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app import db as database, migrations
+from app.config import settings
+from app.models import Notification
+
+
+PRUNE_BATCH_SIZE = 500
+# Pause between batches so writers waiting on the lock get a turn
+BATCH_PAUSE_SECONDS = 0.05
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_notifications(days: int, batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """Delete read notifications created more than days ago; returns the number deleted"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    deleted = 0
+    last_id = 0
+    while True:
+        # Walk the primary key so each batch starts where the previous one stopped
+        batch = (
+            select(Notification.id)
+            .where(Notification.id > last_id, Notification.is_read == True, Notification.created_at < cutoff)
+            .order_by(Notification.id)
+            .limit(batch_size)
+        )
+        async with database.async_session_maker() as session:
+            result = await session.execute(
+                delete(Notification).where(Notification.id.in_(batch)).returning(Notification.id)
+            )
+            ids = list(result.scalars())
+            await session.commit()
+        if not ids:
+            return deleted
+        deleted += len(ids)
+        last_id = max(ids)
+        await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+
+async def run_daily() -> None:
+    """Prune on startup and then once a day, until cancelled"""
+    while True:
+        try:
+            deleted = await prune_notifications(settings.notification_retention_days)
+            if deleted:
+                logger.info("Pruned %d read notifications", deleted)
+        except Exception:
+            logger.exception("Notification retention run failed")
+        await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+
+
+async def _main(days: int, batch_size: int) -> None:
+    await migrations.prepare_database()
+    deleted = await prune_notifications(days, batch_size)
+    await database.engine.dispose()
+    print(f"Deleted {deleted} read notifications older than {days} days")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete old read notifications in small batches")
+    parser.add_argument("--days", type=int, default=settings.notification_retention_days)
+    parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_main(args.days, args.batch_size))
@@ -0,0 +1,118 @@
+"""Per class-day attendance totals, maintained alongside Attendance writes
+
+Long-range class and school level queries read attendance_daily_rollup, one
+row per class and day, instead of one Attendance row per student and day.
+
+Backfill or repair the table from the back-end directory with:
+    python -m app.rollups [--class-id N] [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+import argparse
+import asyncio
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy import and_, delete, func, insert as sql_insert, select, true
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app import db as database
+from app.db import dialect_insert
+from app.models import Attendance, AttendanceDailyRollup, AttendanceStatus
+
+
+STATUSES = [s.value for s in AttendanceStatus]
+
+
+def status_changes(transitions: Iterable[Tuple[Optional[str], Optional[str]]]) -> Dict[str, int]:
+    """Net per-status change for rows moving from an old status (None if new) to a new one"""
+    changes: Dict[str, int] = {}
+    for old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        if old_status:
+            changes[old_status] = changes.get(old_status, 0) - 1
+        if new_status:
+            changes[new_status] = changes.get(new_status, 0) + 1
+    return {status: delta for status, delta in changes.items() if delta}
+
+
+async def apply(db: AsyncSession, class_id: int, day: date, changes: Dict[str, int]) -> None:
+    """Add per-status changes to a class-day row in the caller's transaction"""
+    values = {status: changes.get(status, 0) for status in STATUSES}
+    if not any(values.values()):
+        return
+    insert = dialect_insert(db)
+    stmt = insert(AttendanceDailyRollup).values(class_id=class_id, date=day, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["class_id", "date"],
+        set_={
+            status: getattr(AttendanceDailyRollup, status) + stmt.excluded[status]
+            for status in STATUSES
+        }
+    )
+    await db.execute(stmt)
+
+
+async def lock(db: AsyncSession, class_id: int, day: date) -> None:
+    """Take the class-day rollup row's lock (creating the row if needed) until the transaction ends
+
+    Writers that read old statuses before changing a class-day call this
+    first, so a concurrent writer for the same class-day waits instead of
+    computing its changes from the same stale read.
+    """
+    insert = dialect_insert(db)
+    stmt = insert(AttendanceDailyRollup).values(
+        class_id=class_id, date=day, **{status: 0 for status in STATUSES}
+    )
+    # A no-op DO UPDATE still locks the existing row, which DO NOTHING would not
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["class_id", "date"],
+        set_={STATUSES[0]: getattr(AttendanceDailyRollup, STATUSES[0])}
+    )
+    await db.execute(stmt)
+
+
+async def rebuild(
+    db: Union[AsyncSession, AsyncConnection],
+    class_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> None:
+    """Recompute rollup rows from Attendance, optionally for one class or date range"""
+    def scoped(model, *conditions):
+        if class_id is not None:
+            conditions += (model.class_id == class_id,)
+        if date_from is not None:
+            conditions += (model.date >= date_from,)
+        if date_to is not None:
+            conditions += (model.date <= date_to,)
+        return and_(true(), *conditions)
+
+    await db.execute(delete(AttendanceDailyRollup).where(scoped(AttendanceDailyRollup)))
+    totals = (
+        select(
+            Attendance.class_id,
+            Attendance.date,
+            *[func.count(Attendance.id).filter(Attendance.status == s) for s in STATUSES]
+        )
+        .where(scoped(Attendance))
+        .group_by(Attendance.class_id, Attendance.date)
+    )
+    await db.execute(
+        sql_insert(AttendanceDailyRollup).from_select(["class_id", "date", *STATUSES], totals)
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    async with database.async_session_maker() as session:
+        await rebuild(session, args.class_id, args.date_from, args.date_to)
+        await session.commit()
+    await database.engine.dispose()
+    print("Attendance rollup rebuilt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild attendance_daily_rollup from attendance")
+    parser.add_argument("--class-id", type=int)
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    asyncio.run(_main(parser.parse_args()))
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
+from typing import Optional, List, Generic, TypeVar
 from datetime import datetime, date
 from enum import Enum
 
@@ -26,6 +26,7 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
     user_id: Optional[int] = None
+    exp: Optional[int] = None
 
 
 # User Schemas
@@ -47,7 +48,7 @@ class UserUpdate(BaseModel):
 
 class UserResponse(BaseModel):
     id: int
-    email: EmailStr
+    email: str
     full_name: str
     role: str
     profile_picture: Optional[str] = None
@@ -139,6 +140,10 @@ class StudentUpdate(BaseModel):
 
 
 class StudentResponse(StudentBase):
+    # Emails were validated on the way in; re-checking EmailStr on every row
+    # returned was most of the cost of serializing a student list
+    email: Optional[str] = None
+    parent_email: Optional[str] = None
     id: int
     profile_picture: Optional[str] = None
     class_id: Optional[int] = None
@@ -154,6 +159,20 @@ class StudentWithClass(StudentResponse):
     class_name: Optional[str] = None
 
 
+class StudentImportError(BaseModel):
+    row: int
+    student_id: Optional[str] = None
+    errors: List[str]
+
+
+class StudentImportResult(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    dry_run: bool
+    errors: List[StudentImportError]
+
+
 # Attendance Schemas
 class AttendanceBase(BaseModel):
     student_id: int
@@ -167,10 +186,22 @@ class AttendanceCreate(AttendanceBase):
     pass
 
 
+class AttendanceRecord(BaseModel):
+    student_id: int
+    status: AttendanceStatus = AttendanceStatus.PRESENT
+    notes: Optional[str] = None
+
+
 class AttendanceBulkCreate(BaseModel):
     class_id: int
     date: date
-    attendance_records: List[dict]
+    attendance_records: List[AttendanceRecord]
+
+
+class AttendanceBulkResult(BaseModel):
+    message: str
+    created: int
+    updated: int
 
 
 class AttendanceUpdate(BaseModel):
@@ -202,6 +233,14 @@ class AttendanceReport(BaseModel):
     attendance_summary: List[dict]
 
 
+class AttendanceDailySummary(BaseModel):
+    date: date
+    present: int = 0
+    absent: int = 0
+    late: int = 0
+    excused: int = 0
+
+
 # Dashboard Schemas
 class DashboardStats(BaseModel):
     total_students: int
@@ -231,14 +270,35 @@ class NotificationResponse(NotificationBase):
         from_attributes = True
 
 
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class NotificationMarkRead(BaseModel):
+    ids: List[int] = Field(default_factory=list, max_length=1000)
+    all: bool = False
+
+
+class NotificationMarkReadResult(BaseModel):
+    updated: int
+
+
 class FileUploadResponse(BaseModel):
     filename: str
     url: str
 
 
-class PaginatedResponse(BaseModel):
-    items: List
-    total: int
-    page: int
-    size: int
-    pages: int
+T = TypeVar("T")
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+# Pre-built adapters for the list endpoints (see serialization.adapter_response)
+CLASS_LIST_ADAPTER = TypeAdapter(List[ClassWithStudentCount])
+STUDENT_PAGE_ADAPTER = TypeAdapter(PaginatedResponse[StudentWithClass])
+ATTENDANCE_LIST_ADAPTER = TypeAdapter(List[AttendanceWithStudent])
+ATTENDANCE_PAGE_ADAPTER = TypeAdapter(PaginatedResponse[AttendanceResponse])
@@ -0,0 +1,77 @@
+"""Student name / number search backed by a text index
+
+SQLite uses the students_fts FTS5 table and PostgreSQL a pg_trgm GIN index,
+both created by migration 3 and kept in sync by the database itself.
+"""
+import re
+from typing import List
+
+from sqlalchemy import Select, column, func, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models import Student
+
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+students_fts = table("students_fts", column("rowid"))
+
+# The indexed expression on PostgreSQL; queries must use it verbatim to hit the index
+PG_SEARCH_EXPRESSION = "lower(first_name || ' ' || last_name || ' ' || student_id)"
+_pg_search_text = literal_column(
+    "lower(students.first_name || ' ' || students.last_name || ' ' || students.student_id)"
+)
+
+
+def tokenize(term: str) -> List[str]:
+    return _TOKEN.findall(term.lower())
+
+
+def _fts_query(tokens: List[str]) -> str:
+    # Every token must match as a prefix: "jo smi" -> "jo"* AND "smi"*
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def matching_ids(dialect: str, tokens: List[str]) -> Select:
+    """Ids of students whose names or number start with every token"""
+    if dialect == "postgresql":
+        # \m anchors at a word start, the same prefix match FTS5 does; pg_trgm
+        # indexes regular expressions as well as LIKE
+        query = select(Student.id)
+        for token in tokens:
+            query = query.where(_pg_search_text.regexp_match(rf"\m{token}"))
+        return query
+    return select(students_fts.c.rowid).where(
+        text("students_fts MATCH :fts_query").bindparams(fts_query=_fts_query(tokens))
+    )
+
+
+async def search_students(db: AsyncSession, term: str, limit: int) -> List[Student]:
+    """Best matching active students, most relevant first"""
+    tokens = tokenize(term)
+    if not tokens:
+        return []
+
+    query = (
+        select(Student)
+        .options(joinedload(Student.class_ref))
+        .where(Student.is_active == True)
+        .limit(limit)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.where(Student.id.in_(matching_ids("postgresql", tokens))).order_by(
+            func.similarity(_pg_search_text, " ".join(tokens)).desc(), Student.id
+        )
+    else:
+        query = (
+            query.join(students_fts, students_fts.c.rowid == Student.id)
+            .where(text("students_fts MATCH :fts_query").bindparams(fts_query=_fts_query(tokens)))
+            .order_by(literal_column("bm25(students_fts)"), Student.id)
+        )
+
+    result = await db.execute(query)
+    return list(result.scalars().all())
@@ -0,0 +1,58 @@
+"""JSON and MessagePack rendering for API responses
+
+Routes with a response_model are already serialized by pydantic-core, but
+FastAPI validates whatever the handler returns against the model first. For
+the list endpoints adapter_response validates rows into the response model
+once with a pre-built TypeAdapter and returns the finished bytes, which
+FastAPI passes through untouched. Every other route keeps FastAPI's default
+response class, so its response_model is rendered by pydantic-core's
+dump_json; a custom default_response_class would turn that fast path off.
+
+The list endpoints also answer Accept: application/msgpack when the msgpack
+package is installed. Values are packed in their JSON form (dates as ISO
+strings), so clients decode the same shapes either way.
+"""
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; clients then always get JSON
+    msgpack = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def negotiate(request: Request) -> str:
+    """The media type to answer with: MessagePack if asked for and available, else JSON"""
+    if msgpack is None:
+        return JSON
+    accept = request.headers.get("accept", "")
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        if media_type.strip().lower() in _MSGPACK_TYPES and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            return MSGPACK
+    return JSON
+
+
+def adapter_response(adapter: TypeAdapter, content: Any, request: Request, response: Response) -> Response:
+    """Validate content (rows may be attribute objects) and render it in the negotiated format
+
+    Headers already set on the route's response parameter, such as an ETag,
+    are carried over.
+    """
+    value = adapter.validate_python(content, from_attributes=True)
+    media_type = negotiate(request)
+    if media_type == MSGPACK:
+        body = msgpack.packb(adapter.dump_python(value, mode="json"))
+    else:
+        body = adapter.dump_json(value)
+    rendered = Response(content=body, media_type=media_type)
+    rendered.headers.raw.extend(response.headers.raw)
+    rendered.headers.add_vary_header("Accept")
+    return rendered
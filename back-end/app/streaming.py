@@ -0,0 +1,66 @@
+"""Streaming responses fed from a server-side cursor
+
+The generators open their own session instead of using the request's, so the
+cursor stays valid for as long as the response body is being sent. Queries
+selecting a single entity are streamed as scalars, anything else as rows;
+either way each row is validated into the given schema before encoding.
+"""
+import csv
+import io
+from typing import AsyncIterator, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from app import db as database
+
+
+STREAM_BATCH_SIZE = 500
+
+
+def _selects_entity(query: Select) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+
+async def _partitions(query: Select, schema: Type[BaseModel]) -> AsyncIterator[List[BaseModel]]:
+    async with database.async_session_maker() as session:
+        query = query.execution_options(yield_per=STREAM_BATCH_SIZE)
+        if _selects_entity(query):
+            result = await session.stream_scalars(query)
+        else:
+            result = await session.stream(query)
+        async for partition in result.partitions():
+            yield [schema.model_validate(row) for row in partition]
+
+
+async def stream_json_array(query: Select, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """Serialize the query's rows one by one as a JSON array"""
+    yield b"["
+    first = True
+    async for items in _partitions(query, schema):
+        chunk = b",".join(item.model_dump_json().encode() for item in items)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+async def stream_ndjson(query: Select, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    async for items in _partitions(query, schema):
+        yield b"".join(item.model_dump_json().encode() + b"\n" for item in items)
+
+
+async def stream_csv(query: Select, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """CSV with a header row taken from the schema's fields"""
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    async for items in _partitions(query, schema):
+        writer.writerows(item.model_dump(mode="json") for item in items)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
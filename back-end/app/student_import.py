@@ -0,0 +1,144 @@
+"""Bulk student import from CSV or a JSON array
+
+Rows are validated against StudentCreate in chunks. Each chunk costs one
+query for existing student numbers / emails, one for unknown class ids and
+one executemany insert, instead of a SELECT and INSERT per student. Rows
+that fail are reported by number (1-based, not counting the CSV header) and
+skipped; the rest are imported.
+"""
+import csv
+import io
+import json
+from typing import Any, Dict, List, Set
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import counters
+from app.models import Class, Student
+from app.schemas import StudentCreate
+
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ROWS = 10000
+
+
+def parse_rows(body: bytes, content_type: str) -> List[Any]:
+    """Decode a CSV (with header row) or JSON array request body into raw rows"""
+    media_type = content_type.split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+
+    if media_type == "text/csv":
+        reader = csv.DictReader(io.StringIO(text))
+        # Blank cells mean "not provided" so optional fields fall back to their defaults
+        rows = [
+            {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+            for row in reader
+        ]
+    elif media_type == "application/json":
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of students")
+    else:
+        raise HTTPException(status_code=415, detail="Send students as text/csv or application/json")
+
+    if len(rows) > IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Import is limited to {IMPORT_MAX_ROWS} rows")
+    return rows
+
+
+def _describe(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+async def import_students(db: AsyncSession, rows: List[Any], dry_run: bool = False) -> Dict[str, Any]:
+    """Validate and insert rows chunk by chunk; with dry_run nothing is written"""
+    errors = []
+    imported = 0
+    seen_ids: Set[str] = set()
+    seen_emails: Set[str] = set()
+    known_classes: Set[int] = set()
+
+    for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        valid = []
+        for number, raw in enumerate(rows[start:start + IMPORT_CHUNK_SIZE], start=start + 1):
+            if not isinstance(raw, dict):
+                errors.append({"row": number, "errors": ["row: Expected an object"]})
+                continue
+            try:
+                valid.append((number, StudentCreate.model_validate(raw)))
+            except ValidationError as e:
+                student_id = raw.get("student_id")
+                errors.append({
+                    "row": number,
+                    "student_id": student_id if isinstance(student_id, str) else None,
+                    "errors": _describe(e)
+                })
+
+        if not valid:
+            continue
+
+        student_ids = {student.student_id for _, student in valid}
+        emails = {student.email for _, student in valid if student.email}
+        conditions = [Student.student_id.in_(student_ids)]
+        if emails:
+            conditions.append(Student.email.in_(emails))
+        result = await db.execute(select(Student.student_id, Student.email).where(or_(*conditions)))
+        taken_ids, taken_emails = set(), set()
+        for student_id, email in result.all():
+            taken_ids.add(student_id)
+            taken_emails.add(email)
+
+        class_ids = {student.class_id for _, student in valid if student.class_id is not None}
+        if class_ids - known_classes:
+            result = await db.execute(select(Class.id).where(Class.id.in_(class_ids - known_classes)))
+            known_classes.update(result.scalars())
+
+        new_rows = []
+        for number, student in valid:
+            problems = []
+            if student.student_id in taken_ids:
+                problems.append("student_id: Student ID already exists")
+            elif student.student_id in seen_ids:
+                problems.append("student_id: Duplicate student ID in import")
+            if student.email and student.email in taken_emails:
+                problems.append("email: Email already in use")
+            elif student.email and student.email in seen_emails:
+                problems.append("email: Duplicate email in import")
+            if student.class_id is not None and student.class_id not in known_classes:
+                problems.append("class_id: Class not found")
+
+            seen_ids.add(student.student_id)
+            if student.email:
+                seen_emails.add(student.email)
+            if problems:
+                errors.append({"row": number, "student_id": student.student_id, "errors": problems})
+            else:
+                new_rows.append(student.model_dump())
+
+        if new_rows and not dry_run:
+            await db.execute(insert(Student), new_rows)
+        imported += len(new_rows)
+
+    if imported and not dry_run:
+        await counters.increment(db, {counters.STUDENTS: imported, counters.STUDENTS_VERSION: 1})
+
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "total": len(rows),
+        "imported": imported,
+        "failed": len(errors),
+        "dry_run": dry_run,
+        "errors": errors
+    }
@@ -0,0 +1,74 @@
+"""Query count and latency of GET /api/attendance as the class grows
+
+Run from the back-end directory:
+    python -m benchmarks.attendance_query_count
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import date
+
+from benchmarks.common import scratch_app
+from app.models import Class, Student, Attendance
+
+
+CLASS_SIZES = [10, 40, 160, 640]
+REPEAT = 20
+
+
+async def run() -> list:
+    results = []
+    async with scratch_app() as (scratch, client):
+        headers = await scratch.create_admin()
+        today = date.today()
+        for size in CLASS_SIZES:
+            async with scratch.session_maker() as session:
+                cls = Class(name=f"Class of {size}")
+                session.add(cls)
+                await session.flush()
+                students = [
+                    Student(student_id=f"{cls.id}-{i}", first_name="First", last_name=f"Last{i}", class_id=cls.id)
+                    for i in range(size)
+                ]
+                session.add_all(students)
+                await session.flush()
+                session.add_all([
+                    Attendance(student_id=s.id, class_id=cls.id, date=today, status="present")
+                    for s in students
+                ])
+                await session.commit()
+                class_id = cls.id
+
+            params = {"class_id": class_id, "date": today.isoformat()}
+            # Warm up first so the auth caches don't skew the count
+            await client.get("/api/attendance", params=params, headers=headers)
+            scratch.queries.reset()
+            response = await client.get("/api/attendance", params=params, headers=headers)
+            response.raise_for_status()
+            queries = scratch.queries.count
+
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                await client.get("/api/attendance", params=params, headers=headers)
+            elapsed = (time.perf_counter() - started) / REPEAT
+
+            results.append({
+                "class_size": size,
+                "rows": len(response.json()),
+                "queries": queries,
+                "mean_ms": round(elapsed * 1000, 3)
+            })
+    return results
+
+
+def main():
+    results = asyncio.run(run())
+    print(json.dumps(results, indent=2))
+    if len({r["queries"] for r in results}) != 1:
+        print("Query count grows with class size", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
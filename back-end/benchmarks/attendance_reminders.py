@@ -0,0 +1,61 @@
+"""Attendance reminder run time for a district of classes
+
+Seeds a district (see benchmarks.district) of CLASSES classes with one student
+each, marks attendance today for every other class, then times
+reminders.send_reminders and counts its statements.
+A second run for the same day must send nothing.
+
+Run from the back-end directory:
+    python -m benchmarks.attendance_reminders [classes]
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import func, insert, select
+
+from benchmarks.common import scratch_app
+from benchmarks.district import seed_district
+from app import reminders
+from app.models import Attendance, Notification
+
+
+async def seed(scratch, classes: int, day: date) -> None:
+    district = await seed_district(scratch, classes, 1, years=0)
+    async with scratch.session_maker() as session:
+        await session.execute(insert(Attendance), [
+            {"student_id": district.roster[class_id][0], "class_id": class_id, "date": day, "status": "present"}
+            for class_id in district.class_ids[::2]
+        ])
+        await session.commit()
+
+
+async def timed_run(scratch, day: date) -> dict:
+    scratch.queries.reset()
+    async with scratch.session_maker() as session:
+        started = time.perf_counter()
+        sent = await reminders.send_reminders(session, day)
+        await session.commit()
+        elapsed = time.perf_counter() - started
+    return {"sent": sent, "ms": round(elapsed * 1000, 1), "queries": scratch.queries.count}
+
+
+async def run(classes: int) -> dict:
+    day = date.today()
+    async with scratch_app() as (scratch, _):
+        await seed(scratch, classes, day)
+        first = await timed_run(scratch, day)
+        second = await timed_run(scratch, day)
+        async with scratch.session_maker() as session:
+            result = await session.execute(
+                select(func.count(Notification.id)).where(Notification.notification_type == reminders.REMINDER_TYPE)
+            )
+            stored = result.scalar()
+    return {"classes": classes, "first_run": first, "second_run": second, "reminders_stored": stored}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
@@ -0,0 +1,68 @@
+"""Latency of GET /api/reports/attendance over full academic years
+
+Seeds a district (see benchmarks.district) of CLASSES classes of STUDENTS
+students with YEARS years of school-day attendance (500 x 40 x 180 = 3.6M
+rows by default), then times the term report for a single class and its
+query count.
+
+Run from the back-end directory:
+    python -m benchmarks.attendance_report [classes] [students] [years]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.common import scratch_app
+from benchmarks.district import seed_district
+
+
+REPEAT = 20
+
+
+async def run(classes: int, students: int, years: int) -> dict:
+    async with scratch_app() as (scratch, client):
+        started = time.perf_counter()
+        district = await seed_district(scratch, classes, students, years)
+        seed_seconds = time.perf_counter() - started
+        headers = district.admin_headers
+
+        params = {
+            "class_id": district.class_ids[classes // 2],
+            "date_from": district.days[0].isoformat(),
+            "date_to": district.days[-1].isoformat()
+        }
+        await client.get("/api/reports/attendance", params=params, headers=headers)
+
+        scratch.queries.reset()
+        response = await client.get("/api/reports/attendance", params=params, headers=headers)
+        response.raise_for_status()
+        queries = scratch.queries.count
+
+        samples = []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            (await client.get("/api/reports/attendance", params=params, headers=headers)).raise_for_status()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        report = response.json()
+        return {
+            "attendance_rows": district.attendance_rows,
+            "seed_seconds": round(seed_seconds, 1),
+            "report_students": report["total_students"],
+            "report_days": report["total_days"],
+            "queries": queries,
+            "p50_ms": round(statistics.median(samples), 2),
+            "max_ms": round(max(samples), 2)
+        }
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:4]]
+    classes, students, years = args + [500, 40, 1][len(args):]
+    print(json.dumps(asyncio.run(run(classes, students, years)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
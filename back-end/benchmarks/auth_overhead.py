@@ -0,0 +1,65 @@
+"""Per-request authentication overhead with and without the auth caches
+
+"uncached" clears the token and user caches before every call, which is what
+each request paid before they existed: a JWT signature check plus a user lookup.
+
+Run from the back-end directory:
+    python -m benchmarks.auth_overhead
+"""
+import asyncio
+import json
+import time
+
+from benchmarks.common import scratch_app
+from app import auth
+
+
+ITERATIONS = 2000
+
+
+def _clear_caches():
+    auth._token_cache.clear()
+    auth._user_cache.clear()
+
+
+def bench_decode(token: str) -> dict:
+    results = {}
+    for label, before_each in (("uncached", auth._token_cache.clear), ("cached", lambda: None)):
+        auth.decode_access_token(token)
+        started = time.perf_counter()
+        for _ in range(ITERATIONS):
+            before_each()
+            auth.decode_access_token(token)
+        results[label] = round((time.perf_counter() - started) / ITERATIONS * 1e6, 2)
+    return results
+
+
+async def bench_request(client, headers: dict) -> dict:
+    results = {}
+    for label, before_each in (("uncached", _clear_caches), ("cached", lambda: None)):
+        await client.get("/api/auth/me", headers=headers)
+        started = time.perf_counter()
+        for _ in range(ITERATIONS // 10):
+            before_each()
+            response = await client.get("/api/auth/me", headers=headers)
+            response.raise_for_status()
+        results[label] = round((time.perf_counter() - started) / (ITERATIONS // 10) * 1e6, 2)
+    return results
+
+
+async def run() -> dict:
+    async with scratch_app() as (scratch, client):
+        headers = await scratch.create_admin()
+        token = headers["Authorization"].split()[1]
+        return {
+            "decode_access_token_us": bench_decode(token),
+            "get_me_request_us": await bench_request(client, headers)
+        }
+
+
+def main():
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+from urllib.parse import urlencode
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import migrations
+from app.app import app
+from app.auth import create_access_token, get_password_hash
+from app import db as database
+from app.db import Base, get_db, make_engine
+from app.models import User
+
+
+class QueryCounter:
+    """Records every SQL statement, with its parameters, sent to the scratch engine"""
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    def reset(self):
+        self.statements.clear()
+        self.parameters.clear()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+class Scratch:
+    """A throwaway database wired into the real app through get_db"""
+
+    def __init__(self, engine, session_maker):
+        self.engine = engine
+        self.session_maker = session_maker
+        self.queries = QueryCounter(engine)
+
+    async def create_admin(self, email: str = "admin@example.com") -> dict:
+        async with self.session_maker() as session:
+            user = User(
+                email=email,
+                hashed_password=get_password_hash("benchmark"),
+                full_name="Benchmark Admin",
+                role="admin"
+            )
+            session.add(user)
+            await session.commit()
+            token = create_access_token(data={"sub": user.email, "user_id": user.id})
+        return {"Authorization": f"Bearer {token}"}
+
+
+def asgi_scope(path: str, params: Dict[str, Any], headers: Dict[str, str]) -> dict:
+    """An HTTP GET scope for driving the app directly, for responses test clients would buffer"""
+    return {
+        "type": "http",
+        # Spec 2.4 lets StreamingResponse skip polling receive() for a disconnect
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 0),
+    }
+
+
+@asynccontextmanager
+async def scratch_app() -> AsyncIterator[tuple]:
+    """Yield (scratch, client) with the app served from a temporary SQLite file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await migrations.upgrade(engine)
+
+        async def override_get_db():
+            async with session_maker() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        # Requests get sessions through get_db; streaming responses and jobs use app.db directly
+        app.dependency_overrides[get_db] = override_get_db
+        original_engine, original_session_maker = database.engine, database.async_session_maker
+        database.engine, database.async_session_maker = engine, session_maker
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield Scratch(engine, session_maker), client
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            database.engine, database.async_session_maker = original_engine, original_session_maker
+            await engine.dispose()
@@ -0,0 +1,159 @@
+"""A deterministic synthetic school district for load tests
+
+seed_district fills a scratch database with teachers, classes, students and
+years of school-day attendance. Every name, status and assignment comes from
+a random.Random seeded with the given seed, so the same arguments always
+produce the same rows and runs on different commits can be compared. With
+years=0 only the staff, classes and rosters are seeded.
+
+Attendance is bulk inserted, bypassing the write paths, so the rollups and
+counters are rebuilt afterwards the same way a deployment would backfill them.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+
+from app import counters, rollups
+from app.auth import create_access_token, get_password_hash
+from app.models import Attendance, Class, Student, User
+
+
+SEED = 20240901
+PASSWORD = "benchmark"
+CLASSES_PER_TEACHER = 2
+SCHOOL_DAYS_PER_YEAR = 180
+FIRST_DAY = date(2022, 9, 1)
+INSERT_CHUNK = 5000
+
+FIRST_NAMES = [
+    "Amara", "Ben", "Chen", "Dara", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+    "Kiri", "Leah", "Mateo", "Nia", "Omar", "Priya", "Quinn", "Rosa", "Sok", "Tariq",
+]
+LAST_NAMES = [
+    "Adams", "Bopha", "Costa", "Dubois", "Eriksen", "Fischer", "Garcia", "Huang", "Ivanova", "Jensen",
+    "Kim", "Lopez", "Mensah", "Nguyen", "Okafor", "Patel", "Rossi", "Sato", "Tan", "Vann",
+]
+# Weighted the way a real register looks: mostly present
+STATUS_WEIGHTS = {"present": 88, "absent": 6, "late": 4, "excused": 2}
+
+
+class District:
+    """What was seeded, plus ready-made tokens for driving the API"""
+
+    def __init__(self):
+        self.admin_email = "admin@district.example"
+        self.admin_headers: Dict[str, str] = {}
+        self.teachers: List[dict] = []
+        self.class_ids: List[int] = []
+        self.roster: Dict[int, List[int]] = {}
+        self.days: List[date] = []
+        self.attendance_rows = 0
+
+    def summary(self) -> dict:
+        return {
+            "teachers": len(self.teachers),
+            "classes": len(self.class_ids),
+            "students": sum(len(students) for students in self.roster.values()),
+            "school_days": len(self.days),
+            "attendance_rows": self.attendance_rows,
+        }
+
+
+def school_days(years: int) -> List[date]:
+    """SCHOOL_DAYS_PER_YEAR weekdays from each September, starting at FIRST_DAY"""
+    days = []
+    for year in range(years):
+        day = FIRST_DAY.replace(year=FIRST_DAY.year + year)
+        count = 0
+        while count < SCHOOL_DAYS_PER_YEAR:
+            if day.weekday() < 5:
+                days.append(day)
+                count += 1
+            day += timedelta(days=1)
+    return days
+
+
+def _auth_headers(email: str, user_id: int) -> Dict[str, str]:
+    token = create_access_token(data={"sub": email, "user_id": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def seed_district(scratch, classes: int, students_per_class: int, years: int, seed: int = SEED) -> District:
+    rng = random.Random(seed)
+    district = District()
+    district.days = school_days(years)
+    # One hash for every account keeps seeding fast; login still verifies it in full
+    hashed = get_password_hash(PASSWORD)
+    teachers = max(1, classes // CLASSES_PER_TEACHER)
+
+    async with scratch.session_maker() as session:
+        await session.execute(insert(User), [
+            {"email": district.admin_email, "hashed_password": hashed, "full_name": "District Admin", "role": "admin"}
+        ] + [
+            {
+                "email": f"teacher{t}@district.example",
+                "hashed_password": hashed,
+                "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "role": "teacher"
+            }
+            for t in range(teachers)
+        ])
+        result = await session.execute(select(User.id, User.email, User.role).order_by(User.id))
+        for user_id, email, role in result:
+            if role == "admin":
+                district.admin_headers = _auth_headers(email, user_id)
+            else:
+                district.teachers.append({"id": user_id, "email": email, "headers": _auth_headers(email, user_id)})
+
+        await session.execute(insert(Class), [
+            {
+                "name": f"Grade {7 + c % 6} Section {c // 6 + 1}",
+                "grade_level": str(7 + c % 6),
+                "teacher_id": district.teachers[c % teachers]["id"],
+                "academic_year": f"{FIRST_DAY.year + years - 1}-{FIRST_DAY.year + years}"
+            }
+            for c in range(classes)
+        ])
+        result = await session.execute(select(Class.id, Class.grade_level).order_by(Class.id))
+        grades = result.all()
+        district.class_ids = [class_id for class_id, _ in grades]
+
+        await session.execute(insert(Student), [
+            {
+                "student_id": f"S{c:04d}{i:03d}",
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "email": f"s{c:04d}{i:03d}@district.example",
+                "gender": "female" if i % 2 else "male",
+                # Born the right year for the class grade when the first school year starts
+                "date_of_birth": date(FIRST_DAY.year - 5 - int(grade), 1, 1) + timedelta(days=(c * 31 + i * 7) % 365),
+                "class_id": class_id,
+                "is_active": True
+            }
+            for c, (class_id, grade) in enumerate(grades) for i in range(students_per_class)
+        ])
+        result = await session.execute(select(Student.id, Student.class_id).order_by(Student.id))
+        for student_id, class_id in result:
+            district.roster.setdefault(class_id, []).append(student_id)
+        await session.commit()
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        for class_id in district.class_ids:
+            students = district.roster[class_id]
+            rows = [
+                {"student_id": student_id, "class_id": class_id, "date": day, "status": status}
+                for day in district.days
+                for student_id, status in zip(students, rng.choices(statuses, weights, k=len(students)))
+            ]
+            for start in range(0, len(rows), INSERT_CHUNK):
+                await session.execute(insert(Attendance), rows[start:start + INSERT_CHUNK])
+            district.attendance_rows += len(rows)
+            await session.commit()
+
+        await rollups.rebuild(session)
+        await counters.rebuild(session)
+        await session.commit()
+    return district
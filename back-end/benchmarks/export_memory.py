@@ -0,0 +1,87 @@
+"""Peak memory of the streaming attendance export as the export grows
+
+Seeds a district (see benchmarks.district) of CLASSES classes with at least
+the given number of attendance records, in whole school years, then exports
+growing date ranges through the real app and reports tracemalloc's peak for
+each. The response is consumed directly over ASGI and discarded, since test
+clients buffer whole bodies. Memory is flat when the peak for all rows matches the peak for a tenth of them;
+the run fails if the full export's peak is more than TOLERANCE times the peak
+for a tenth.
+
+Run from the back-end directory (exits 1 if memory grows with the export):
+    python -m benchmarks.export_memory [rows]
+"""
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import asgi_scope, scratch_app
+from benchmarks.district import SCHOOL_DAYS_PER_YEAR, seed_district
+from app.app import app
+
+
+CLASSES = 50
+STUDENTS_PER_CLASS = 40
+# A buffered export grows roughly tenfold from a tenth of the rows to all of them
+TOLERANCE = 1.5
+
+
+async def drain(path: str, params: dict, headers: dict) -> int:
+    """Run one GET through the ASGI app, counting and discarding the body"""
+    received = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    scope = asgi_scope(path, params, headers)
+    await app(scope, receive, send)
+    return received
+
+
+async def run(rows: int) -> list:
+    results = []
+    async with scratch_app() as (scratch, client):
+        rows_per_year = CLASSES * STUDENTS_PER_CLASS * SCHOOL_DAYS_PER_YEAR
+        district = await seed_district(scratch, CLASSES, STUDENTS_PER_CLASS, years=-(-rows // rows_per_year))
+        headers = district.admin_headers
+        await client.get("/api/auth/me", headers=headers)
+
+        tracemalloc.start()
+        for fraction in (0.1, 0.5, 1.0):
+            days = max(1, int(len(district.days) * fraction))
+            params = {"format": "csv", "date_to": district.days[days - 1].isoformat()}
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            size = await drain("/api/export/attendance", params, headers)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            results.append({
+                "rows": days * CLASSES * STUDENTS_PER_CLASS,
+                "bytes_sent": size,
+                "seconds": round(elapsed, 1),
+                "peak_memory_mb": round(peak / 1024 / 1024, 2)
+            })
+        tracemalloc.stop()
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    results = asyncio.run(run(rows))
+    print(json.dumps(results, indent=2))
+    tenth, full = results[0]["peak_memory_mb"], results[-1]["peak_memory_mb"]
+    if full > tenth * TOLERANCE:
+        print(f"Peak memory grew from {tenth} MB to {full} MB, over {TOLERANCE}x", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
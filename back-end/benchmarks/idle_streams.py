@@ -0,0 +1,157 @@
+"""5,000 concurrent idle notification streams on one worker
+
+Opens STREAMS connections to /api/notifications/stream (spread over USERS
+teachers) in a single process and event loop, then reports:
+
+  - how long it took to open them and the memory they hold
+  - event loop lag and SQL statements issued while every stream sits idle
+    (both should be close to zero; idle clients cost no polling queries)
+  - latency until a notification for one user reaches that user's streams,
+    and until a batch of one notification per user reaches all streams
+  - that every stream unsubscribes when its connection is cancelled
+
+Run from the back-end directory (exits 1 if idle streams issue any SQL or a
+stream is still subscribed after close):
+    python -m benchmarks.idle_streams [streams]
+"""
+import asyncio
+import json
+import resource
+import sys
+import time
+
+from sqlalchemy import insert, select
+
+from benchmarks.common import asgi_scope, scratch_app
+from app import notifications
+from app.app import app
+from app.auth import create_access_token, get_password_hash
+from app.models import User
+
+
+USERS = 500
+IDLE_SECONDS = 3
+OPEN_CONCURRENCY = 500
+
+
+class Stream:
+    """One SSE connection driven directly through the ASGI app"""
+
+    def __init__(self, user_id: int, token: str):
+        self.user_id = user_id
+        self.token = token
+        self.events = 0
+        self.received = asyncio.Event()
+        self.task = None
+
+    async def _receive(self):
+        # The client never sends anything and never disconnects on its own
+        await asyncio.Event().wait()
+
+    async def _send(self, message):
+        if message["type"] == "http.response.body" and message.get("body", b"").startswith(b"event:"):
+            self.events += 1
+            self.received.set()
+
+    def open(self) -> None:
+        scope = asgi_scope("/api/notifications/stream", {}, {"Authorization": f"Bearer {self.token}"})
+        self.task = asyncio.create_task(app(scope, self._receive, self._send))
+
+    async def next_event(self) -> None:
+        await self.received.wait()
+        self.received.clear()
+
+
+async def loop_lag(seconds: float) -> float:
+    """Worst overshoot, in ms, of a 10ms sleep over the given period"""
+    worst = 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - started - 0.01)
+    return round(worst * 1000, 2)
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(count: int) -> dict:
+    async with scratch_app() as (scratch, client):
+        admin = await scratch.create_admin()
+        hashed = get_password_hash("benchmark")
+        async with scratch.session_maker() as session:
+            await session.execute(insert(User), [
+                {"email": f"teacher{i}@example.com", "hashed_password": hashed, "full_name": f"Teacher {i}", "role": "teacher"}
+                for i in range(USERS)
+            ])
+            await session.commit()
+            result = await session.execute(select(User.id, User.email).where(User.role == "teacher"))
+            teachers = [(user_id, create_access_token(data={"sub": email, "user_id": user_id})) for user_id, email in result]
+
+        streams = [Stream(*teachers[i % len(teachers)]) for i in range(count)]
+        memory_before = rss_mb()
+        started = time.perf_counter()
+        for batch in range(0, count, OPEN_CONCURRENCY):
+            opening = streams[batch:batch + OPEN_CONCURRENCY]
+            for stream in opening:
+                stream.open()
+            await asyncio.gather(*(stream.next_event() for stream in opening))
+        results = {
+            "streams": notifications.broker.stream_count(),
+            "open_seconds": round(time.perf_counter() - started, 2),
+            "memory_mb": round(rss_mb() - memory_before, 1),
+        }
+
+        scratch.queries.reset()
+        results["idle_seconds"] = IDLE_SECONDS
+        results["idle_loop_lag_ms"] = await loop_lag(IDLE_SECONDS)
+        results["idle_queries"] = scratch.queries.count
+
+        user_id = streams[0].user_id
+        own = [stream for stream in streams if stream.user_id == user_id]
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/notifications",
+            json={"user_id": user_id, "title": "Reminder", "message": "Take attendance"},
+            headers=admin
+        )
+        response.raise_for_status()
+        await asyncio.gather(*(stream.next_event() for stream in own))
+        results["one_user_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        started = time.perf_counter()
+        async with scratch.session_maker() as session:
+            await notifications.create(session, [
+                {"user_id": teacher_id, "title": "Announcement", "message": "School closes early"}
+                for teacher_id, _ in teachers
+            ])
+            await session.commit()
+        await asyncio.gather(*(stream.next_event() for stream in streams))
+        results["all_users_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        for stream in streams:
+            stream.task.cancel()
+        await asyncio.gather(*(stream.task for stream in streams), return_exceptions=True)
+        results["streams_after_close"] = notifications.broker.stream_count()
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = asyncio.run(run(count))
+    print(json.dumps(results, indent=2))
+    failures = []
+    if results["idle_queries"] != 0:
+        failures.append(f"{results['idle_queries']} statements issued while every stream was idle")
+    if results["streams_after_close"] != 0:
+        failures.append(f"{results['streams_after_close']} streams still subscribed after close")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Load test of the API hot paths against a seeded district
+
+Seeds a deterministic district (see benchmarks.district) into a scratch
+database, then drives the real FastAPI app in process through an ASGI client.
+Each scenario sends REQUESTS requests from CONCURRENCY concurrent workers,
+after a short warm-up, and reports throughput and p50/p95/p99 latency.
+Request parameters come from a seeded random.Random too, so two runs with the
+same arguments send the same requests; save the JSON from each commit and
+compare.
+
+  login             POST /api/auth/login (bcrypt verify on every call)
+  students          GET /api/students, one class page of 50
+  classes           GET /api/classes as a teacher
+  attendance        GET /api/attendance for a class and past school day
+  bulk_attendance   POST /api/attendance/bulk re-marking a whole class
+  dashboard         GET /api/dashboard/stats as admin and as teachers
+
+Run from the back-end directory:
+    python -m benchmarks.load [--classes 40] [--students 30] [--years 1]
+        [--requests 200] [--concurrency 10] [--scenario NAME ...] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import scratch_app
+from benchmarks.district import PASSWORD, SEED, District, seed_district
+
+
+WARMUP = 10
+STATUSES = ["present", "absent", "late", "excused"]
+
+
+def _login(client, district: District, rng: random.Random) -> Awaitable:
+    teacher = rng.choice(district.teachers)
+    return client.post("/api/auth/login", json={"email": teacher["email"], "password": PASSWORD})
+
+
+def _students(client, district: District, rng: random.Random) -> Awaitable:
+    params = {"class_id": rng.choice(district.class_ids), "limit": 50}
+    return client.get("/api/students", params=params, headers=district.admin_headers)
+
+
+def _classes(client, district: District, rng: random.Random) -> Awaitable:
+    return client.get("/api/classes", headers=rng.choice(district.teachers)["headers"])
+
+
+def _attendance(client, district: District, rng: random.Random) -> Awaitable:
+    params = {"class_id": rng.choice(district.class_ids), "date": rng.choice(district.days).isoformat()}
+    return client.get("/api/attendance", params=params, headers=district.admin_headers)
+
+
+def _bulk_attendance(client, district: District, rng: random.Random) -> Awaitable:
+    class_id = rng.choice(district.class_ids)
+    body = {
+        "class_id": class_id,
+        "date": rng.choice(district.days).isoformat(),
+        "attendance_records": [
+            {"student_id": student_id, "status": rng.choice(STATUSES)}
+            for student_id in district.roster[class_id]
+        ]
+    }
+    return client.post("/api/attendance/bulk", json=body, headers=district.admin_headers)
+
+
+def _dashboard(client, district: District, rng: random.Random) -> Awaitable:
+    headers = district.admin_headers if rng.random() < 0.2 else rng.choice(district.teachers)["headers"]
+    return client.get("/api/dashboard/stats", headers=headers)
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": _login,
+    "students": _students,
+    "classes": _classes,
+    "attendance": _attendance,
+    "bulk_attendance": _bulk_attendance,
+    "dashboard": _dashboard,
+}
+
+
+def percentiles(samples: List[float]) -> dict:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": round(cuts[49], 2), "p95_ms": round(cuts[94], 2), "p99_ms": round(cuts[98], 2)}
+
+
+async def run_scenario(client, district: District, name: str, requests: int, concurrency: int, seed: int) -> dict:
+    make_request = SCENARIOS[name]
+    rng = random.Random(f"{seed}:{name}")
+    for _ in range(WARMUP):
+        (await make_request(client, district, rng)).raise_for_status()
+
+    # Seed every request up front so worker scheduling cannot change what is sent
+    plan = [rng.getrandbits(64) for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(offset: int) -> None:
+        nonlocal errors
+        for index in range(offset, requests, concurrency):
+            started = time.perf_counter()
+            response = await make_request(client, district, random.Random(plan[index]))
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        **percentiles(latencies),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+async def run(args) -> dict:
+    async with scratch_app() as (scratch, client):
+        started = time.perf_counter()
+        district = await seed_district(scratch, args.classes, args.students, args.years, args.seed)
+        seed_seconds = time.perf_counter() - started
+
+        scenarios = {}
+        for name in args.scenario or SCENARIOS:
+            scenarios[name] = await run_scenario(client, district, name, args.requests, args.concurrency, args.seed)
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "parameters": {
+            "classes": args.classes,
+            "students_per_class": args.students,
+            "years": args.years,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "district": {**district.summary(), "seed_seconds": round(seed_seconds, 2)},
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API hot paths against a seeded district")
+    parser.add_argument("--classes", type=int, default=40)
+    parser.add_argument("--students", type=int, default=30, help="students per class")
+    parser.add_argument("--years", type=int, default=1, help="years of attendance history")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
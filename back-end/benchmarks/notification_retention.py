@@ -0,0 +1,109 @@
+"""Bulk mark-as-read and batched pruning of read notifications
+
+Seeds NOTIFICATIONS notifications for one teacher (old ones read, recent
+ones unread), then reports:
+
+  - PUT /api/notifications/read with all=true: statements and time, and that
+    the unread counter matches the table afterwards
+  - retention.prune_notifications: rows deleted and total time, while another
+    task keeps inserting notifications; its worst insert latency shows how
+    long writers wait on the pruning transactions
+
+Run from the back-end directory:
+    python -m benchmarks.notification_retention [notifications]
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from benchmarks.common import scratch_app
+from app import notifications, retention
+from app.auth import create_access_token
+from app.models import Notification, User
+
+
+RETENTION_DAYS = 90
+UNREAD = 5000
+
+
+async def seed(scratch, count: int) -> tuple:
+    async with scratch.session_maker() as session:
+        teacher = User(email="teacher@example.com", hashed_password="-", full_name="Teacher", role="teacher")
+        session.add(teacher)
+        await session.flush()
+        now = datetime.utcnow()
+        old = now - timedelta(days=RETENTION_DAYS + 30)
+        await session.execute(insert(Notification), [
+            {"user_id": teacher.id, "title": "Old", "message": "Read long ago", "is_read": True, "created_at": old}
+            for _ in range(count - UNREAD)
+        ])
+        await notifications.create(session, [
+            {"user_id": teacher.id, "title": "New", "message": "Not read yet"}
+            for _ in range(UNREAD)
+        ])
+        await session.commit()
+        token = create_access_token(data={"sub": teacher.email, "user_id": teacher.id})
+    return teacher.id, {"Authorization": f"Bearer {token}"}
+
+
+async def writer(scratch, user_id: int, stop: asyncio.Event) -> list:
+    """Insert one notification at a time until stopped; returns each insert's latency in ms"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        async with scratch.session_maker() as session:
+            await notifications.create(session, [{"user_id": user_id, "title": "Live", "message": "During prune"}])
+            await session.commit()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run(count: int) -> dict:
+    async with scratch_app() as (scratch, client):
+        user_id, headers = await seed(scratch, count)
+
+        scratch.queries.reset()
+        started = time.perf_counter()
+        response = await client.put("/api/notifications/read", json={"all": True}, headers=headers)
+        response.raise_for_status()
+        mark_read = {
+            "updated": response.json()["updated"],
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "queries": scratch.queries.count,
+        }
+        response = await client.get("/api/notifications/unread_count", headers=headers)
+        mark_read["unread_after"] = response.json()["unread"]
+
+        # The rows just marked read are recent, so only the old ones are pruned
+        stop = asyncio.Event()
+        writing = asyncio.create_task(writer(scratch, user_id, stop))
+        started = time.perf_counter()
+        deleted = await retention.prune_notifications(RETENTION_DAYS)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        latencies = await writing
+
+        async with scratch.session_maker() as session:
+            remaining = (await session.execute(select(func.count(Notification.id)))).scalar()
+    return {
+        "notifications": count,
+        "mark_all_read": mark_read,
+        "prune": {
+            "deleted": deleted,
+            "batch_size": retention.PRUNE_BATCH_SIZE,
+            "seconds": round(elapsed, 2),
+            "concurrent_inserts": len(latencies),
+            "worst_insert_ms": round(max(latencies), 1),
+        },
+        "remaining": remaining,
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
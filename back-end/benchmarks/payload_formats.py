@@ -0,0 +1,92 @@
+"""Payload size and encode time of a student roster in each response format
+
+Encodes a 1,000 student roster (the StudentWithClass list the students
+endpoint returns) as JSON and MessagePack, each raw and compressed the way
+CompressionMiddleware does it, and reports bytes on the wire and encode time.
+A page is also fetched through the app to confirm the negotiated headers.
+
+Run from the back-end directory (needs msgpack; brotli rows need brotli):
+    python -m benchmarks.payload_formats [students]
+"""
+import asyncio
+import gzip
+import json
+import statistics
+import sys
+import time
+
+import msgpack
+from sqlalchemy import select
+
+from benchmarks.common import scratch_app
+from benchmarks.serialization import seed
+from app.compression import BROTLI_QUALITY, GZIP_LEVEL, brotli
+from app.models import Class, Student
+from app.schemas import STUDENT_PAGE_ADAPTER
+
+
+REPEAT = 30
+
+
+def timed(func) -> tuple:
+    func()
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        body = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return body, round(statistics.median(samples), 3)
+
+
+def formats(value) -> dict:
+    encoders = {
+        "json": lambda: STUDENT_PAGE_ADAPTER.dump_json(value),
+        "msgpack": lambda: msgpack.packb(STUDENT_PAGE_ADAPTER.dump_python(value, mode="json")),
+    }
+    results = {}
+    for name, encode in encoders.items():
+        body, encode_ms = timed(encode)
+        results[name] = {"bytes": len(body), "encode_ms": encode_ms}
+        compressed, ms = timed(lambda: gzip.compress(body, GZIP_LEVEL))
+        results[f"{name}+gzip"] = {"bytes": len(compressed), "encode_ms": round(encode_ms + ms, 3)}
+        if brotli is not None:
+            compressed, ms = timed(lambda: brotli.compress(body, quality=BROTLI_QUALITY))
+            results[f"{name}+br"] = {"bytes": len(compressed), "encode_ms": round(encode_ms + ms, 3)}
+    return results
+
+
+async def run(count: int) -> dict:
+    async with scratch_app() as (scratch, client):
+        district = await seed(scratch, count, years=0)
+        headers = district.admin_headers
+        async with scratch.session_maker() as session:
+            result = await session.execute(
+                select(*Student.__table__.columns, Class.name.label("class_name"))
+                .outerjoin(Class, Class.id == Student.class_id)
+                .order_by(Student.last_name, Student.id)
+                .limit(count)
+            )
+            rows = result.all()
+        value = STUDENT_PAGE_ADAPTER.validate_python(
+            {"items": rows, "next_cursor": None, "limit": count}, from_attributes=True
+        )
+
+        wire = {}
+        for accept in ("application/json", "application/msgpack"):
+            response = await client.get(
+                "/api/students",
+                params={"limit": 500},
+                headers={**headers, "Accept": accept, "Accept-Encoding": "br, gzip"}
+            )
+            response.raise_for_status()
+            wire[accept] = {
+                "content_type": response.headers["content-type"],
+                "content_encoding": response.headers.get("content-encoding"),
+                "vary": response.headers.get("vary"),
+            }
+    return {"students": count, "formats": formats(value), "app_headers": wire}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
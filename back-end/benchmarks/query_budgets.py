@@ -0,0 +1,198 @@
+"""SQL statement budgets per endpoint
+
+Hooks before_cursor_execute on app.db.engine (the scratch engine while
+scratch_app is active), records the statements issued while serving each
+request, and checks them against BUDGETS. Every route is measured against a
+small and a large seeded district; a route fails if it goes over its budget
+or if its count changes with the data size, which is how an N+1 loop shows up.
+
+The auth caches are warmed before measuring, so the counts are what each
+route itself costs; every request is measured the first time it is sent.
+
+Run from the back-end directory (exits 1 on any failure):
+    python -m benchmarks.query_budgets [--verbose]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+
+from benchmarks.common import scratch_app
+from benchmarks.district import District, seed_district
+from app import db as database, notifications
+
+
+# (classes, students per class) for the two runs; one year of attendance each
+SIZES = [(4, 5), (16, 40)]
+
+
+def _student_page(client, district: District):
+    return client.get("/api/students", params={"limit": 50}, headers=district.admin_headers)
+
+
+def _class_students(client, district: District):
+    params = {"class_id": district.class_ids[0], "limit": 50}
+    return client.get("/api/students", params=params, headers=district.admin_headers)
+
+
+def _student(client, district: District):
+    student_id = district.roster[district.class_ids[0]][0]
+    return client.get(f"/api/students/{student_id}", headers=district.admin_headers)
+
+
+def _classes_admin(client, district: District):
+    return client.get("/api/classes", headers=district.admin_headers)
+
+
+def _classes_teacher(client, district: District):
+    return client.get("/api/classes", headers=district.teachers[0]["headers"])
+
+
+def _attendance(client, district: District):
+    params = {"class_id": district.class_ids[0], "date": district.days[-1].isoformat()}
+    return client.get("/api/attendance", params=params, headers=district.admin_headers)
+
+
+def _bulk_attendance(client, district: District):
+    class_id = district.class_ids[0]
+    body = {
+        "class_id": class_id,
+        "date": district.days[-1].isoformat(),
+        "attendance_records": [
+            {"student_id": student_id, "status": "late"} for student_id in district.roster[class_id]
+        ]
+    }
+    return client.post("/api/attendance/bulk", json=body, headers=district.admin_headers)
+
+
+def _student_attendance(client, district: District):
+    student_id = district.roster[district.class_ids[0]][0]
+    return client.get(f"/api/attendance/student/{student_id}", headers=district.admin_headers)
+
+
+def _report(client, district: District):
+    params = {
+        "class_id": district.class_ids[0],
+        "date_from": district.days[0].isoformat(),
+        "date_to": district.days[-1].isoformat()
+    }
+    return client.get("/api/reports/attendance", params=params, headers=district.admin_headers)
+
+
+def _daily_report(client, district: District):
+    params = {
+        "date_from": (district.days[-1] - timedelta(days=30)).isoformat(),
+        "date_to": district.days[-1].isoformat()
+    }
+    return client.get("/api/reports/attendance/daily", params=params, headers=district.admin_headers)
+
+
+def _dashboard(client, district: District):
+    return client.get("/api/dashboard/stats", headers=district.teachers[0]["headers"])
+
+
+def _users(client, district: District):
+    return client.get("/api/users", params={"limit": 50}, headers=district.admin_headers)
+
+
+def _notifications(client, district: District):
+    return client.get("/api/notifications", headers=district.teachers[0]["headers"])
+
+
+def _mark_all_read(client, district: District):
+    return client.put("/api/notifications/read", json={"all": True}, headers=district.teachers[0]["headers"])
+
+
+# name: (maximum statements per request, request). Reads are usually a version
+# or counter lookup plus the data query; bulk attendance also locks the
+# class-day and moves the counters and the rollup.
+BUDGETS: Dict[str, Tuple[int, Callable]] = {
+    "GET /api/students": (2, _student_page),
+    "GET /api/students?class_id": (2, _class_students),
+    "GET /api/students/{id}": (2, _student),
+    "GET /api/classes (admin)": (2, _classes_admin),
+    "GET /api/classes (teacher)": (2, _classes_teacher),
+    "GET /api/attendance": (1, _attendance),
+    "POST /api/attendance/bulk": (5, _bulk_attendance),
+    "GET /api/attendance/student/{id}": (1, _student_attendance),
+    "GET /api/reports/attendance": (2, _report),
+    "GET /api/reports/attendance/daily": (1, _daily_report),
+    "GET /api/dashboard/stats": (1, _dashboard),
+    "GET /api/users": (1, _users),
+    "GET /api/notifications": (1, _notifications),
+    "PUT /api/notifications/read": (2, _mark_all_read),
+}
+
+
+@contextmanager
+def recorded_statements() -> Iterator[List[str]]:
+    """Collect the SQL sent through app.db.engine inside the block"""
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    target = database.engine.sync_engine
+    event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", record)
+
+
+async def measure(classes: int, students: int) -> Dict[str, List[str]]:
+    """The statements each budgeted request issues against a district of the given size"""
+    measured = {}
+    async with scratch_app() as (scratch, client):
+        district = await seed_district(scratch, classes, students, years=1)
+        teacher = district.teachers[0]
+        async with scratch.session_maker() as session:
+            await notifications.create(session, [
+                {"user_id": teacher["id"], "title": "Notice", "message": f"Notice {i}"}
+                for i in range(classes * students)
+            ])
+            await session.commit()
+        for headers in (district.admin_headers, teacher["headers"]):
+            (await client.get("/api/auth/me", headers=headers)).raise_for_status()
+
+        for name, (_, make_request) in BUDGETS.items():
+            with recorded_statements() as statements:
+                response = await make_request(client, district)
+            response.raise_for_status()
+            measured[name] = statements
+    return measured
+
+
+def check(runs: List[Dict[str, List[str]]], verbose: bool) -> Tuple[list, list]:
+    results, failures = [], []
+    for name, (budget, _) in BUDGETS.items():
+        counts = [len(run[name]) for run in runs]
+        results.append({"route": name, "budget": budget, "queries": counts})
+        if max(counts) > budget:
+            failures.append(f"{name}: {max(counts)} statements, budget {budget}")
+        if len(set(counts)) > 1:
+            failures.append(f"{name}: statement count grows with data size {counts}")
+        if verbose and (max(counts) > budget or len(set(counts)) > 1):
+            for statement in runs[-1][name]:
+                failures.append("    " + " ".join(statement.split()))
+    return results, failures
+
+
+async def run(verbose: bool) -> int:
+    runs = [await measure(classes, students) for classes, students in SIZES]
+    results, failures = check(runs, verbose)
+    print(json.dumps({"sizes": SIZES, "routes": results}, indent=2))
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check per-endpoint SQL statement budgets")
+    parser.add_argument("--verbose", action="store_true", help="print the statements of failing routes")
+    sys.exit(asyncio.run(run(parser.parse_args().verbose)))
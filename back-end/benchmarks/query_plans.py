@@ -0,0 +1,103 @@
+"""Check that the hot read queries are served by the composite indexes
+
+Serves each request through the real app against a seeded scratch
+database, then runs EXPLAIN QUERY PLAN on the SQL it actually issued.
+Exits non-zero if a query does not use one of its expected indexes.
+
+Run from the back-end directory:
+    python -m benchmarks.query_plans
+"""
+import asyncio
+import sys
+
+from sqlalchemy import insert, text
+
+from benchmarks.common import scratch_app
+from benchmarks.district import District, seed_district
+from app import counters
+from app.models import Notification
+
+
+CLASSES = 10
+STUDENTS_PER_CLASS = 30
+
+
+async def seed(scratch) -> District:
+    district = await seed_district(scratch, CLASSES, STUDENTS_PER_CLASS, years=1)
+    teacher_id = district.teachers[0]["id"]
+    async with scratch.session_maker() as session:
+        await session.execute(insert(Notification), [
+            {"user_id": teacher_id, "title": "Reminder", "message": "Take attendance"} for _ in range(100)
+        ])
+        await session.commit()
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+    return district
+
+
+async def explain(scratch, statement, parameters) -> str:
+    async with scratch.engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        cursor = await raw.driver_connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        rows = await cursor.fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+async def last_query_plan(scratch, client, headers, path, params=None, match="FROM attendance"):
+    scratch.queries.reset()
+    response = await client.get(path, params=params, headers=headers)
+    response.raise_for_status()
+    for statement, parameters in zip(reversed(scratch.queries.statements), reversed(scratch.queries.parameters)):
+        if match in statement:
+            return await explain(scratch, statement, parameters)
+    raise AssertionError(f"No query matching {match!r} for {path}")
+
+
+async def run() -> bool:
+    ok = True
+    async with scratch_app() as (scratch, client):
+        district = await seed(scratch)
+        headers = district.admin_headers
+        teacher_headers = district.teachers[0]["headers"]
+        for user_headers in (headers, teacher_headers):
+            await client.get("/api/auth/me", headers=user_headers)
+
+        class_id = district.class_ids[2]
+        checks = [
+            ("GET /api/attendance", ["ix_attendance_class_date"], headers,
+             "/api/attendance", {"class_id": class_id, "date": district.days[-1].isoformat()}, "FROM attendance"),
+            ("GET /api/attendance/student/{id}", ["ix_attendance_student_date"], headers,
+             f"/api/attendance/student/{district.roster[class_id][0]}", None, "FROM attendance"),
+            ("GET /api/students?class_id", ["ix_students_class_active", "ix_students_active_name"], headers,
+             "/api/students", {"class_id": class_id}, "FROM students"),
+            ("GET /api/students", ["ix_students_active_name"], headers,
+             "/api/students", None, "FROM students"),
+            ("GET /api/notifications", ["ix_notifications_user_created"], teacher_headers,
+             "/api/notifications", None, "FROM notifications"),
+        ]
+        for label, expected, user_headers, path, params, match in checks:
+            plan = await last_query_plan(scratch, client, user_headers, path, params, match)
+            used = any(name in plan for name in expected)
+            ok = ok and used
+            print(f"{'ok  ' if used else 'FAIL'} {label}: {plan}")
+
+        # Counter rebuilds aggregate attendance by day and status
+        async with scratch.session_maker() as session:
+            scratch.queries.reset()
+            await counters.rebuild(session)
+        for statement, parameters in zip(scratch.queries.statements, scratch.queries.parameters):
+            if "GROUP BY attendance.date, attendance.status" in statement:
+                plan = await explain(scratch, statement, parameters)
+                used = "ix_attendance_date_status" in plan
+                ok = ok and used
+                print(f"{'ok  ' if used else 'FAIL'} counters.rebuild: {plan}")
+    return ok
+
+
+def main():
+    if not asyncio.run(run()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
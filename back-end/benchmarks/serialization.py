@@ -0,0 +1,129 @@
+"""Per-row serialization cost of the student and attendance list responses
+
+Loads the same rows the list endpoints return, as ORM entities and as plain
+column rows, and times the step from loaded rows to response bytes:
+
+  encoder:  jsonable_encoder + json.dumps (FastAPI's path without a model)
+  orm:      ORM entities validated into the response model, then dumped
+            (what get_students / get_student_attendance used to do)
+  columns:  column rows validated once with the pre-built TypeAdapter
+            (serialization.adapter_response, used by the endpoints now)
+
+orm and columns also report load_us_per_row, the cost of fetching the rows.
+
+Run from the back-end directory:
+    python -m benchmarks.serialization [rows]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import scratch_app
+from benchmarks.district import District, seed_district
+from app.models import Attendance, Class, Student
+from app.schemas import (
+    AttendanceResponse, StudentWithClass, ATTENDANCE_PAGE_ADAPTER, STUDENT_PAGE_ADAPTER
+)
+
+
+STUDENTS_PER_CLASS = 25
+REPEAT = 30
+
+
+async def seed(scratch, count: int, years: int = 1) -> District:
+    """A district with at least count students and years of their attendance"""
+    classes = -(-count // STUDENTS_PER_CLASS)
+    return await seed_district(scratch, classes, STUDENTS_PER_CLASS, years)
+
+
+def median_us(samples, rows: int) -> float:
+    return round(statistics.median(samples) * 1e6 / rows, 2)
+
+
+def per_row(func, rows: int) -> dict:
+    func()
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        body = func()
+        samples.append(time.perf_counter() - started)
+    return {"us_per_row": median_us(samples, rows), "bytes": len(body)}
+
+
+async def load(scratch, query, scalars: bool, rows: int):
+    """Fetch query results REPEAT times in fresh sessions; return the last rows and the load cost"""
+    samples = []
+    for _ in range(REPEAT):
+        async with scratch.session_maker() as session:
+            started = time.perf_counter()
+            result = await session.execute(query)
+            loaded = result.scalars().all() if scalars else result.all()
+            samples.append(time.perf_counter() - started)
+    return loaded, median_us(samples, rows)
+
+
+def page(items) -> dict:
+    return {"items": items, "next_cursor": None, "limit": len(items)}
+
+
+async def run(count: int) -> dict:
+    async with scratch_app() as (scratch, _):
+        await seed(scratch, count)
+        student_entities, student_entity_load = await load(
+            scratch, select(Student).options(joinedload(Student.class_ref)).limit(count), True, count
+        )
+        student_rows, student_row_load = await load(
+            scratch,
+            select(*Student.__table__.columns, Class.name.label("class_name"))
+            .outerjoin(Class, Class.id == Student.class_id)
+            .limit(count),
+            False, count
+        )
+        attendance_entities, attendance_entity_load = await load(scratch, select(Attendance).limit(count), True, count)
+        attendance_rows, attendance_row_load = await load(
+            scratch, select(*Attendance.__table__.columns).limit(count), False, count
+        )
+
+    def encoder(schema, entities):
+        models = [schema.model_validate(entity) for entity in entities]
+        return json.dumps(jsonable_encoder(page(models))).encode("utf-8")
+
+    def adapter(adapter, rows):
+        return adapter.dump_json(adapter.validate_python(page(rows), from_attributes=True))
+
+    return {
+        "rows": count,
+        "students": {
+            "encoder": per_row(lambda: encoder(StudentWithClass, student_entities), count),
+            "orm": {
+                **per_row(lambda: adapter(STUDENT_PAGE_ADAPTER, student_entities), count),
+                "load_us_per_row": student_entity_load
+            },
+            "columns": {
+                **per_row(lambda: adapter(STUDENT_PAGE_ADAPTER, student_rows), count),
+                "load_us_per_row": student_row_load
+            },
+        },
+        "attendance": {
+            "encoder": per_row(lambda: encoder(AttendanceResponse, attendance_entities), count),
+            "orm": {
+                **per_row(lambda: adapter(ATTENDANCE_PAGE_ADAPTER, attendance_entities), count),
+                "load_us_per_row": attendance_entity_load
+            },
+            "columns": {
+                **per_row(lambda: adapter(ATTENDANCE_PAGE_ADAPTER, attendance_rows), count),
+                "load_us_per_row": attendance_row_load
+            },
+        },
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
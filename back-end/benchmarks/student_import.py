@@ -0,0 +1,79 @@
+"""Onboarding a school: one import call against a POST per student
+
+Imports the same roster through POST /api/students/import (CSV) and through
+POST /api/students one row at a time, reporting wall time and the number of
+SQL statements each needed. A dry run of the import is measured as well.
+
+Run from the back-end directory:
+    python -m benchmarks.student_import [students]
+"""
+import asyncio
+import csv
+import io
+import json
+import sys
+import time
+
+from benchmarks.common import scratch_app
+
+
+def roster(count: int, prefix: str) -> list:
+    return [
+        {
+            "student_id": f"{prefix}-{i:05d}",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i % 250}",
+            "email": f"{prefix.lower()}{i}@example.com",
+            "gender": "female" if i % 2 else "male",
+        }
+        for i in range(count)
+    ]
+
+
+def to_csv(rows: list) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def run(count: int) -> dict:
+    results = {"students": count}
+    async with scratch_app() as (scratch, client):
+        headers = await scratch.create_admin()
+        await client.get("/api/auth/me", headers=headers)
+
+        body = to_csv(roster(count, "IMP"))
+        for name, dry_run in (("import_dry_run", True), ("import", False)):
+            scratch.queries.reset()
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/students/import",
+                params={"dry_run": dry_run},
+                content=body,
+                headers={**headers, "Content-Type": "text/csv"}
+            )
+            response.raise_for_status()
+            report = response.json()
+            assert report["imported"] == count and report["failed"] == 0, report
+            results[name] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "queries": scratch.queries.count
+            }
+
+        scratch.queries.reset()
+        started = time.perf_counter()
+        for student in roster(count, "ONE"):
+            response = await client.post("/api/students", json=student, headers=headers)
+            response.raise_for_status()
+        results["one_by_one"] = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "queries": scratch.queries.count
+        }
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
@@ -0,0 +1,83 @@
+"""Student search latency against a primary key lookup at 100k students
+
+Seeds a district (see benchmarks.district) with the given number of students,
+rounded up to whole classes, then compares GET /api/students/search with
+GET /api/students/{id} and with the ILIKE '%term%' scan the list endpoint used
+before the search index.
+
+Run from the back-end directory:
+    python -m benchmarks.student_search [students]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from sqlalchemy import or_, select
+
+from benchmarks.common import scratch_app
+from benchmarks.district import seed_district
+from app.models import Student
+
+
+STUDENTS_PER_CLASS = 40
+REPEAT = 200
+
+
+async def timed(func) -> dict:
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3)
+    }
+
+
+async def run(count: int) -> dict:
+    async with scratch_app() as (scratch, client):
+        district = await seed_district(scratch, -(-count // STUDENTS_PER_CLASS), STUDENTS_PER_CLASS, years=0)
+        headers = district.admin_headers
+        students = [student_id for class_id in district.class_ids for student_id in district.roster[class_id]]
+
+        async def pk_lookup():
+            (await client.get(f"/api/students/{students[len(students) // 2]}", headers=headers)).raise_for_status()
+
+        # The last student's number, so the scan can't stop early after finding enough rows
+        async with scratch.session_maker() as session:
+            needle = (await session.execute(select(Student.student_id).where(Student.id == students[-1]))).scalar()
+
+        async def indexed_search():
+            response = await client.get("/api/students/search", params={"q": needle}, headers=headers)
+            response.raise_for_status()
+
+        async def ilike_scan():
+            term = f"%{needle}%"
+            async with scratch.session_maker() as session:
+                result = await session.execute(
+                    select(Student).where(
+                        Student.is_active == True,
+                        or_(Student.first_name.ilike(term), Student.last_name.ilike(term), Student.student_id.ilike(term))
+                    ).limit(20)
+                )
+                result.scalars().all()
+
+        return {
+            "students": len(students),
+            "primary_key_lookup": await timed(pk_lookup),
+            "search_endpoint": await timed(indexed_search),
+            "ilike_scan_query_only": await timed(ilike_scan)
+        }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(json.dumps(asyncio.run(run(count)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
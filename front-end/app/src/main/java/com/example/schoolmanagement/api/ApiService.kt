@@ -26,7 +26,10 @@ interface ApiService {
     // ==================== USER ENDPOINTS ====================
 
     @GET("api/users")
-    suspend fun getUsers(): Response<List<User>>
+    suspend fun getUsers(
+        @Query("limit") limit: Int? = null,
+        @Query("cursor") cursor: String? = null
+    ): Response<PaginatedResponse<User>>
 
     @GET("api/users/{userId}")
     suspend fun getUser(@Path("userId") userId: Int): Response<User>
@@ -65,8 +68,10 @@ interface ApiService {
     @GET("api/students")
     suspend fun getStudents(
         @Query("class_id") classId: Int? = null,
-        @Query("search") search: String? = null
-    ): Response<List<Student>>
+        @Query("search") search: String? = null,
+        @Query("limit") limit: Int? = null,
+        @Query("cursor") cursor: String? = null
+    ): Response<PaginatedResponse<Student>>
 
     @GET("api/students/{studentId}")
     suspend fun getStudent(@Path("studentId") studentId: Int): Response<Student>
@@ -95,7 +100,11 @@ interface ApiService {
     ): Response<List<Attendance>>
 
     @GET("api/attendance/student/{studentId}")
-    suspend fun getStudentAttendance(@Path("studentId") studentId: Int): Response<List<Attendance>>
+    suspend fun getStudentAttendance(
+        @Path("studentId") studentId: Int,
+        @Query("limit") limit: Int? = null,
+        @Query("cursor") cursor: String? = null
+    ): Response<PaginatedResponse<Attendance>>
 
     // ==================== DASHBOARD ENDPOINTS ====================
 
@@ -2,14 +2,18 @@ package com.example.schoolmanagement.api
 
 import android.content.Context
 import com.google.gson.GsonBuilder
+import okhttp3.Cache
 import okhttp3.OkHttpClient
 import okhttp3.logging.HttpLoggingInterceptor
 import retrofit2.Retrofit
 import retrofit2.converter.gson.GsonConverterFactory
+import java.io.File
 import java.util.concurrent.TimeUnit
 
 object RetrofitClient {
 
+    private const val HTTP_CACHE_SIZE = 10L * 1024 * 1024
+
     private var retrofit: Retrofit? = null
     private var apiService: ApiService? = null
     private var tokenManager: TokenManager? = null
@@ -24,7 +28,11 @@ object RetrofitClient {
                 level = HttpLoggingInterceptor.Level.BODY
             }
 
+            // Lets OkHttp revalidate classes and students with If-None-Match instead of refetching
+            val httpCache = Cache(File(context.cacheDir, "http"), HTTP_CACHE_SIZE)
+
             val okHttpClient = OkHttpClient.Builder()
+                .cache(httpCache)
                 .addInterceptor(AuthInterceptor(tokenManager!!))
                 .addInterceptor(loggingInterceptor)
                 .connectTimeout(30, TimeUnit.SECONDS)
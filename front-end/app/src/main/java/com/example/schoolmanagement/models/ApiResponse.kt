@@ -6,6 +6,12 @@ data class MessageResponse(
     @SerializedName("message") val message: String
 )
 
+data class PaginatedResponse<T>(
+    @SerializedName("items") val items: List<T>,
+    @SerializedName("next_cursor") val nextCursor: String?,
+    @SerializedName("limit") val limit: Int
+)
+
 data class ErrorResponse(
     @SerializedName("detail") val detail: String
 )
@@ -32,12 +32,19 @@ class AttendanceRepository {
     suspend fun getStudentAttendance(studentId: Int): Resource<List<Attendance>> {
         return withContext(Dispatchers.IO) {
             try {
-                val response = apiService.getStudentAttendance(studentId)
-                if (response.isSuccessful && response.body() != null) {
-                    Resource.Success(response.body()!!)
-                } else {
-                    Resource.Error(parseError(response))
-                }
+                // Follow next_cursor until the last page so older records are not dropped
+                val records = mutableListOf<Attendance>()
+                var cursor: String? = null
+                do {
+                    val response = apiService.getStudentAttendance(studentId, PAGE_SIZE, cursor)
+                    if (!response.isSuccessful || response.body() == null) {
+                        return@withContext Resource.Error(parseError(response))
+                    }
+                    val page = response.body()!!
+                    records.addAll(page.items)
+                    cursor = page.nextCursor
+                } while (cursor != null)
+                Resource.Success(records)
             } catch (e: Exception) {
                 Resource.Error(e.message ?: "Unknown error occurred")
             }
@@ -79,6 +86,11 @@ class AttendanceRepository {
         }
     }
 
+    companion object {
+        // Largest page the API serves
+        private const val PAGE_SIZE = 500
+    }
+
     private fun <T> parseError(response: Response<T>): String {
         return try {
             val errorBody = response.errorBody()?.string()
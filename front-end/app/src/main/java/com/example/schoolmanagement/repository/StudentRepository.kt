@@ -17,12 +17,19 @@ class StudentRepository {
     suspend fun getStudents(classId: Int? = null, search: String? = null): Resource<List<Student>> {
         return withContext(Dispatchers.IO) {
             try {
-                val response = apiService.getStudents(classId, search)
-                if (response.isSuccessful && response.body() != null) {
-                    Resource.Success(response.body()!!)
-                } else {
-                    Resource.Error(parseError(response))
-                }
+                // Follow next_cursor until the last page so the list is never cut short
+                val students = mutableListOf<Student>()
+                var cursor: String? = null
+                do {
+                    val response = apiService.getStudents(classId, search, PAGE_SIZE, cursor)
+                    if (!response.isSuccessful || response.body() == null) {
+                        return@withContext Resource.Error(parseError(response))
+                    }
+                    val page = response.body()!!
+                    students.addAll(page.items)
+                    cursor = page.nextCursor
+                } while (cursor != null)
+                Resource.Success(students)
             } catch (e: Exception) {
                 Resource.Error(e.message ?: "Unknown error occurred")
             }
@@ -89,6 +96,11 @@ class StudentRepository {
         }
     }
 
+    companion object {
+        // Largest page the API serves
+        private const val PAGE_SIZE = 500
+    }
+
     private fun <T> parseError(response: Response<T>): String {
         return try {
             val errorBody = response.errorBody()?.string()